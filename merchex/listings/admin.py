@@ -9,11 +9,44 @@ from __future__ import annotations
 
 # EN: Import Django's admin interface
 # FR : Importation de l'interface d'administration Django
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin.utils import flatten_fieldsets
+from django.http import HttpResponseRedirect
 
 # EN: Import local models to register them in the admin site
 # FR : Importation des modèles locaux pour les enregistrer dans le site d'administration
-from listings.models import Band, Listing
+from listings.models import Band, Change, Job, Listing, VersionConflict
+
+# EN: Hidden version field and conflict message shared with the edit views
+# FR : Champ caché de version et message de conflit partagés avec les vues d'édition
+from listings.concurrency import CONFLICT_MESSAGE
+from listings.forms import VersionedModelForm
+
+
+class VersionedAdmin(admin.ModelAdmin):
+    """
+    FR : Admin des modèles versionnés : le formulaire transporte la version de départ, save() écrit donc
+         WHERE version = N ; en cas de conflit, rien n'est écrit et la page est rechargée avec un message.
+    EN : Admin of versioned models: the form carries the starting version, so save() writes
+         WHERE version = N; on a conflict nothing is written and the page is reloaded with a message.
+    """
+
+    form = VersionedModelForm
+
+    def get_form(self, request, obj=None, change=False, **kwargs):
+        # EN: "version" is a declared form field, not an editable model field: keep it out of the factory's fields
+        # FR : "version" est un champ déclaré du formulaire, pas un champ éditable du modèle : hors des champs de la fabrique
+        fields = kwargs["fields"] if "fields" in kwargs else flatten_fieldsets(self.get_fieldsets(request, obj))
+        if fields is not None:
+            kwargs["fields"] = [name for name in fields if name != "version"]
+        return super().get_form(request, obj, change, **kwargs)
+
+    def changeform_view(self, request, object_id=None, form_url="", extra_context=None):
+        try:
+            return super().changeform_view(request, object_id, form_url, extra_context)
+        except VersionConflict:
+            self.message_user(request, CONFLICT_MESSAGE, messages.ERROR)
+            return HttpResponseRedirect(request.get_full_path())
 
 
 # ========================================
@@ -22,8 +55,35 @@ from listings.models import Band, Listing
 
 # EN: Register Band model so it appears in the Django admin
 # FR : Enregistrer le modèle Band pour qu'il apparaisse dans l'admin Django
-admin.site.register(Band)
+admin.site.register(Band, VersionedAdmin)
 
 # EN: Register Listing model so it appears in the Django admin
 # FR : Enregistrer le modèle Listing pour qu'il apparaisse dans l'admin Django
-admin.site.register(Listing)
+admin.site.register(Listing, VersionedAdmin)
+
+# EN: Register Job model to follow background jobs (status, progress, errors)
+# FR : Enregistrer le modèle Job pour suivre les tâches de fond (statut, progression, erreurs)
+admin.site.register(Job)
+
+# EN: Register Change model to inspect the change log (read-only: the log is append-only)
+# FR : Enregistrer le modèle Change pour consulter le journal des changements (lecture seule : journal append-only)
+@admin.register(Change)
+class ChangeAdmin(admin.ModelAdmin):
+    """
+    FR : Admin en lecture seule du journal des changements : aucun ajout, modification ni suppression,
+         un consommateur qui lit « changements depuis N » ne doit jamais voir l'historique réécrit.
+    EN : Read-only admin of the change log: no add, change or delete, so a consumer reading
+         "changes since N" never sees history rewritten.
+    """
+
+    list_display = ("seq", "action", "model", "object_id", "created_at")
+    list_filter = ("action",)
+
+    def has_add_permission(self, request) -> bool:
+        return False
+
+    def has_change_permission(self, request, obj=None) -> bool:
+        return False
+
+    def has_delete_permission(self, request, obj=None) -> bool:
+        return False
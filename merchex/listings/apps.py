@@ -25,3 +25,10 @@ class ListingsConfig(AppConfig):
     # EN: Name used by Django to refer to this app
     # FR : Nom utilisé par Django pour référencer cette app
     name = "listings"
+
+    def ready(self):
+        """
+        EN: Connect the change-log signal receivers.
+        FR : Connecter les récepteurs de signaux du journal des changements.
+        """
+        from listings import signals  # noqa: F401
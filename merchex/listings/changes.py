@@ -0,0 +1,65 @@
+"""
+Module: listings/changes.py
+
+EN: Reading the change log: paginated "changes since sequence N" and a consumer helper for other systems.
+    Bilingual comments (EN/FR).
+FR : Lecture du journal des changements : « changements depuis la séquence N » paginé et un assistant
+     consommateur pour les autres systèmes. Commentaires bilingues (EN/FR).
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+from listings.models import Change
+
+
+# EN: Page size bounds of the changes endpoint
+# FR : Bornes de taille de page de l'endpoint des changements
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 1000
+
+
+def changes_since(since: int, limit: int = DEFAULT_LIMIT) -> dict:
+    """
+    FR : Page de changements de séquence > `since`, par ordre croissant (index de clé primaire, O(limit)).
+         Retour : {"changes": [...], "next_since": int, "has_more": bool} ; rappeler avec since=next_since.
+    EN : Page of changes with sequence > `since`, ascending (primary-key index, O(limit)).
+         Returns: {"changes": [...], "next_since": int, "has_more": bool}; call again with since=next_since.
+    """
+    limit = max(1, min(limit, MAX_LIMIT))
+    # EN: One extra row tells whether another page exists
+    # FR : Une ligne de plus indique s'il existe une autre page
+    rows = list(
+        Change.objects.filter(seq__gt=since)
+        .order_by("seq")
+        .values("seq", "model", "object_id", "action", "data", "created_at")[: limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    for row in rows:
+        row["created_at"] = row["created_at"].isoformat()
+    return {"changes": rows, "next_since": rows[-1]["seq"] if rows else since, "has_more": has_more}
+
+
+def consume(url: str, since: int = 0, limit: int = DEFAULT_LIMIT, timeout: float = 10) -> Iterator[dict]:
+    """
+    FR : Assistant consommateur (HTTP, bibliothèque standard uniquement) : parcourt toutes les pages de
+         l'endpoint `url` (ex. "https://merchex.xyz/changes/") à partir de `since`.
+         Le consommateur doit persister le dernier `seq` traité et le repasser comme `since` à l'appel suivant.
+         Retour : itérateur de changements. Erreurs : urllib.error.URLError si l'endpoint est injoignable.
+    EN : Consumer helper (HTTP, standard library only): walk every page of the endpoint `url`
+         (e.g. "https://merchex.xyz/changes/") starting after `since`.
+         The consumer should persist the last processed `seq` and pass it back as `since` next time.
+         Returns: iterator of changes. Errors: urllib.error.URLError if the endpoint is unreachable.
+    """
+    while True:
+        with urlopen(f"{url}?{urlencode({'since': since, 'limit': limit})}", timeout=timeout) as response:
+            page = json.load(response)
+        yield from page["changes"]
+        since = page["next_since"]
+        if not page["has_more"]:
+            return
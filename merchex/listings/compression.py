@@ -0,0 +1,117 @@
+"""
+Module: listings/compression.py
+
+EN: Response compression with Accept-Encoding negotiation: brotli when installed, gzip otherwise.
+    Bilingual comments (EN/FR).
+FR : Compression des réponses avec négociation Accept-Encoding : brotli s'il est installé, gzip sinon.
+     Commentaires bilingues (EN/FR).
+"""
+
+from __future__ import annotations
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import has_vary_header, patch_vary_headers
+
+# EN: Optional dependency: `pip install brotli` enables the "br" encoding
+# FR : Dépendance optionnelle : `pip install brotli` active l'encodage "br"
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+
+def accepted_encodings(header: str) -> dict[str, float]:
+    """
+    FR : Analyse un en-tête Accept-Encoding en {encodage: q}. Ex. "br;q=1, gzip;q=0.5".
+    EN : Parse an Accept-Encoding header into {coding: q}. E.g. "br;q=1, gzip;q=0.5".
+    """
+    codings = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        codings[coding.strip().lower()] = quality
+    return codings
+
+
+def _brotli_sequence(sequence):
+    """
+    FR : Compresse un flux morceau par morceau ; chaque morceau est vidé pour garder un TTFB bas.
+    EN : Compress a stream chunk by chunk; each chunk is flushed to keep time-to-first-byte low.
+    """
+    compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+    for chunk in sequence:
+        data = compressor.process(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def may_reflect_secrets(request, response) -> bool:
+    """
+    FR : Vrai si la réponse peut contenir un secret (jeton CSRF, données de session) à côté d'une entrée
+         contrôlée par l'attaquant : brotli n'y est pas utilisé, gzip de Django ajoutant un bourrage
+         aléatoire contre BREACH.
+    EN : True when the response may carry a secret (CSRF token, session data) next to attacker-controlled
+         input: brotli is not used there, as Django's gzip adds random padding against BREACH.
+    """
+    return bool(request.META.get("CSRF_COOKIE_USED")) or has_vary_header(response, "Cookie")
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    FR : GZipMiddleware étendu : ignore les réponses plus petites que COMPRESSION_MIN_LENGTH, respecte les
+         valeurs q d'Accept-Encoding et préfère brotli quand il est installé et accepté par le client.
+         Les pages pouvant refléter des secrets gardent le gzip avec bourrage (voir may_reflect_secrets()).
+    EN : Extended GZipMiddleware: skips responses smaller than COMPRESSION_MIN_LENGTH, honours
+         Accept-Encoding q-values and prefers brotli when installed and accepted by the client.
+         Pages that may reflect secrets keep the padded gzip path (see may_reflect_secrets()).
+    """
+
+    def process_response(self, request, response):
+        # EN: Small responses are not worth the CPU (and may grow once compressed)
+        # FR : Les petites réponses ne valent pas le coût CPU (et peuvent grossir une fois compressées)
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_LENGTH:
+            return response
+        if response.has_header("Content-Encoding"):
+            return response
+
+        codings = accepted_encodings(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        use_brotli = (
+            brotli is not None
+            and codings.get("br", 0) > 0
+            and not getattr(response, "is_async", False)
+            and not may_reflect_secrets(request, response)
+        )
+        if not use_brotli:
+            if codings.get("gzip", codings.get("*", 0)) > 0:
+                return super().process_response(request, response)
+            patch_vary_headers(response, ("Accept-Encoding",))
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        if response.streaming:
+            response.streaming_content = _brotli_sequence(response.streaming_content)
+            del response.headers["Content-Length"]
+        else:
+            compressed = brotli.compress(response.content, quality=settings.COMPRESSION_BROTLI_QUALITY)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(response.content))
+
+        # EN: Same ETag weakening as GZipMiddleware (RFC 9110 Section 8.8.1)
+        # FR : Même affaiblissement de l'ETag que GZipMiddleware (RFC 9110 section 8.8.1)
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = "br"
+        return response
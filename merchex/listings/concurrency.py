@@ -0,0 +1,71 @@
+"""
+Module: listings/concurrency.py
+
+EN: Optimistic concurrency for edit views: conditional UPDATE on the version column, changed fields only.
+    Bilingual comments (EN/FR).
+FR : Concurrence optimiste pour les vues d'édition : UPDATE conditionnel sur la colonne version, champs
+     modifiés uniquement. Commentaires bilingues (EN/FR).
+"""
+
+from __future__ import annotations
+
+from django.db.models import F
+from django.http import Http404
+
+# EN: Message shown when another edit was saved in the meantime
+# FR : Message affiché quand une autre modification a été enregistrée entre-temps
+CONFLICT_MESSAGE = (
+    "Cet élément a été modifié par quelqu'un d'autre pendant votre édition. "
+    "Vérifiez les valeurs ci-dessous puis enregistrez à nouveau. / "
+    "This item was changed by someone else while you were editing. Review the values below and save again."
+)
+
+
+def save_changed_fields(form) -> bool:
+    """
+    FR : Enregistre un VersionedModelForm valide par
+         UPDATE ... SET <champs modifiés>, version = version + 1 WHERE id = ... AND version = N.
+         Préconditions : form.is_valid() a été appelé. Retour : True si écrit (ou rien à écrire),
+         False en cas de conflit de version (aucune écriture).
+    EN : Save a valid VersionedModelForm with
+         UPDATE ... SET <changed fields>, version = version + 1 WHERE id = ... AND version = N.
+         Preconditions: form.is_valid() was called. Returns: True when written (or nothing to write),
+         False on a version conflict (nothing written).
+    """
+    instance = form.instance
+    model = type(instance)
+    expected = form.cleaned_data["version"]
+
+    editable = {field.name for field in model._meta.concrete_fields if field.editable}
+    update_fields = [name for name in form.changed_data if name in editable]
+
+    if not update_fields:
+        # EN: Nothing to write; still report a conflict if the row moved on
+        # FR : Rien à écrire ; signaler tout de même un conflit si la ligne a changé
+        return model.objects.filter(pk=instance.pk, version=expected).exists()
+
+    values = {name: getattr(instance, name) for name in update_fields}
+    written = model.objects.filter(pk=instance.pk, version=expected).update(**values, version=F("version") + 1)
+    if written:
+        instance.version = expected + 1
+    return bool(written)
+
+
+def conflict_form(form_class, request, instance):
+    """
+    FR : Formulaire à ré-afficher après un conflit : les valeurs saisies par l'utilisateur, la version courante
+         de la ligne (un nouvel envoi écrasera donc volontairement) et le message de conflit.
+         Retour : formulaire lié avec une erreur globale. Erreurs : Http404 si la ligne a été supprimée entre-temps.
+    EN : Form to re-render after a conflict: the values the user typed, the row's current version
+         (so a new submit knowingly overwrites) and the conflict message.
+         Returns: bound form with a non-field error. Errors: Http404 if the row was deleted meanwhile.
+    """
+    current = type(instance).objects.filter(pk=instance.pk).first()
+    if current is None:
+        raise Http404(f"No {instance._meta.object_name} matches the given query.")
+    data = request.POST.copy()
+    data["version"] = current.version
+    form = form_class(data, instance=current)
+    form.is_valid()
+    form.add_error(None, CONFLICT_MESSAGE)
+    return form
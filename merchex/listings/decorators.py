@@ -0,0 +1,23 @@
+"""
+Module: listings/decorators.py
+
+EN: View decorators for the "listings" app. Bilingual comments (EN/FR).
+FR : Décorateurs de vues pour l'application "listings". Commentaires bilingues (EN/FR).
+"""
+
+from __future__ import annotations
+
+
+def anonymous_read_only(view):
+    """
+    FR : Marque une vue comme lecture seule publique : pour un GET/HEAD anonyme, AnonymousReadOnlyMiddleware
+         saute session, authentification, messages et CSRF, et rend la réponse cachable en amont.
+         Préconditions : la vue ne doit lire ni request.session ni les messages. Retour : la vue elle-même.
+    EN : Mark a view as public read-only: on an anonymous GET/HEAD, AnonymousReadOnlyMiddleware skips
+         sessions, auth, messages and CSRF, and makes the response cacheable upstream.
+         Preconditions: the view must not read request.session or messages. Returns: the view itself.
+    """
+    # EN: Same flag-attribute approach as Django's csrf_exempt
+    # FR : Même approche par attribut que csrf_exempt de Django
+    view.anonymous_read_only = True
+    return view
@@ -38,10 +38,39 @@ class ContactUsForm(forms.Form):
     message = forms.CharField(max_length=1000)
 
 
+# ==========================================
+#  Versioned base form / Formulaire versionné
+# ==========================================
+class VersionedModelForm(forms.ModelForm):
+    """
+    EN: ModelForm carrying the instance version in a hidden field (optimistic concurrency, see listings/concurrency.py).
+    FR : ModelForm qui transporte la version de l'instance dans un champ caché (concurrence optimiste, voir listings/concurrency.py).
+    """
+
+    # EN: Version the user started editing from (not a model field of the form: `version` is not editable).
+    #     Required when editing: a POST without it must not silently overwrite.
+    # FR : Version à partir de laquelle l'utilisateur a commencé à éditer (`version` n'est pas éditable).
+    #      Obligatoire en édition : un POST sans elle ne doit pas écraser silencieusement.
+    version = forms.IntegerField(widget=forms.HiddenInput, min_value=0)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["version"].initial = self.instance.version
+        # EN: A new instance has no version to protect / FR : Une nouvelle instance n'a pas de version à protéger
+        self.fields["version"].required = not self.instance._state.adding
+
+    def _post_clean(self):
+        super()._post_clean()
+        # EN: instance.save() (admin) then writes WHERE version = <version the user started from>
+        # FR : instance.save() (admin) écrit alors WHERE version = <version de départ de l'utilisateur>
+        if not self.instance._state.adding and self.cleaned_data.get("version") is not None:
+            self.instance.version = self.cleaned_data["version"]
+
+
 # ===============================
 #  Band form / Formulaire de groupe
 # ===============================
-class BandForm(forms.ModelForm):
+class BandForm(VersionedModelForm):
     """
     EN: Form bound to the Band model.
     FR : Formulaire lié au modèle Band.
@@ -57,7 +86,7 @@ class BandForm(forms.ModelForm):
 # ====================================
 #  Listing form / Formulaire d'annonce
 # ====================================
-class ListingForm(forms.ModelForm):
+class ListingForm(VersionedModelForm):
     """
     EN: Form bound to the Listing model.
     FR : Formulaire lié au modèle Listing.
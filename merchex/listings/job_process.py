@@ -0,0 +1,32 @@
+"""
+Module: listings/job_process.py
+
+EN: Entry points for `run_jobs --processes`. Spawned children import this module before Django is set up,
+    so it must not import models at module level. Bilingual comments (EN/FR).
+FR : Points d'entrée de `run_jobs --processes`. Les processus enfants importent ce module avant la
+     configuration de Django : il ne doit donc pas importer de modèles au niveau du module. Commentaires bilingues (EN/FR).
+"""
+
+from __future__ import annotations
+
+
+def init() -> None:
+    """
+    FR : Initialiseur des processus du pool : configure Django et découvre les modules `tasks`.
+    EN : Pool process initializer: set up Django and discover `tasks` modules.
+    """
+    import django
+    from django.utils.module_loading import autodiscover_modules
+
+    django.setup()
+    autodiscover_modules("tasks")
+
+
+def run_by_id(job_id: int) -> str:
+    """
+    FR : Exécute la tâche `job_id` dans le processus courant. Retour : statut final.
+    EN : Run job `job_id` in the current process. Returns: final status.
+    """
+    from listings import jobs
+
+    return jobs.run_by_id(job_id)
@@ -0,0 +1,230 @@
+"""
+Module: listings/jobs.py
+
+EN: Lightweight database-backed job queue (no Celery, no broker): task registry, enqueue, claim and run.
+    Bilingual comments (EN/FR).
+FR : File de tâches légère stockée en base (sans Celery ni broker) : registre des tâches, mise en file,
+     prise en charge et exécution. Commentaires bilingues (EN/FR).
+"""
+
+from __future__ import annotations
+
+import logging
+import traceback
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from listings.models import Job
+
+
+logger = logging.getLogger(__name__)
+
+# EN: Registered tasks: name -> callable(job, **payload)
+# FR : Tâches enregistrées : nom -> callable(job, **payload)
+TASKS: dict = {}
+
+# EN: Base delay of the exponential retry backoff (seconds)
+# FR : Délai de base du backoff exponentiel entre tentatives (secondes)
+RETRY_BASE_DELAY = 10
+
+# EN: Seconds between two lock refreshes of a running job; must stay well below run_jobs --stale-after
+# FR : Secondes entre deux rafraîchissements du verrou d'une tâche en cours ; doit rester bien en dessous
+#      de run_jobs --stale-after
+HEARTBEAT_INTERVAL = 60
+
+
+def task(name: str):
+    """
+    FR : Décorateur : enregistre une fonction `func(job, **payload)` sous `name`.
+         Les modules `<app>/tasks.py` sont découverts automatiquement par le worker.
+    EN : Decorator: register a function `func(job, **payload)` under `name`.
+         `<app>/tasks.py` modules are discovered automatically by the worker.
+    """
+
+    def decorator(func):
+        TASKS[name] = func
+        return func
+
+    return decorator
+
+
+def enqueue(
+    name: str,
+    payload: dict | None = None,
+    *,
+    priority: int = 0,
+    idempotency_key: str | None = None,
+    max_attempts: int = 3,
+) -> Job:
+    """
+    FR : Met une tâche en file. Si `idempotency_key` existe déjà, renvoie la tâche existante (aucun doublon).
+         Retour : Job.
+    EN : Queue a job. If `idempotency_key` already exists, the existing job is returned (no duplicate).
+         Returns: Job.
+    """
+    try:
+        with transaction.atomic():
+            return Job.objects.create(
+                name=name,
+                payload=payload or {},
+                priority=priority,
+                idempotency_key=idempotency_key,
+                max_attempts=max_attempts,
+            )
+    except IntegrityError:
+        if idempotency_key is None:
+            raise
+        return Job.objects.get(idempotency_key=idempotency_key)
+
+
+def claim(worker: str) -> Job | None:
+    """
+    FR : Prend la prochaine tâche prête (priorité décroissante puis ancienneté) pour `worker`.
+         La prise est un UPDATE conditionnel (status = QUEUED) : deux workers ne peuvent pas prendre la même.
+         Retour : Job verrouillé ou None si la file est vide.
+    EN : Claim the next ready job (highest priority, then oldest) for `worker`.
+         The claim is a conditional UPDATE (status = QUEUED), so two workers can never take the same job.
+         Returns: locked Job, or None when the queue is empty.
+    """
+    while True:
+        now = timezone.now()
+        candidate = (
+            Job.objects.filter(status=Job.Status.QUEUED, run_after__lte=now)
+            .order_by("-priority", "run_after", "id")
+            .values_list("id", flat=True)
+            .first()
+        )
+        if candidate is None:
+            return None
+        claimed = Job.objects.filter(id=candidate, status=Job.Status.QUEUED).update(
+            status=Job.Status.RUNNING,
+            locked_by=worker,
+            locked_at=now,
+            attempts=F("attempts") + 1,
+        )
+        if claimed:
+            return Job.objects.get(id=candidate)
+        # EN: Another worker won the race; try the next candidate
+        # FR : Un autre worker a gagné la course ; essayer le candidat suivant
+
+
+def report_progress(job: Job, done: int, total: int, message: str = "") -> None:
+    """
+    FR : Enregistre la progression d'une tâche (visible dans l'admin et via `manage.py run_jobs --status`).
+         Rafraîchit aussi `locked_at` : une tâche qui progresse n'est jamais considérée comme abandonnée.
+    EN : Store a job's progress (visible in the admin and via `manage.py run_jobs --status`).
+         Also refreshes `locked_at`: a job that makes progress is never considered stale.
+    """
+    job.progress_done, job.progress_total, job.progress_message = done, total, message[:200]
+    job.locked_at = timezone.now()
+    Job.objects.filter(id=job.id, status=Job.Status.RUNNING).update(
+        progress_done=done, progress_total=total, progress_message=message[:200], locked_at=job.locked_at
+    )
+
+
+def heartbeat(worker: str, job_ids) -> int:
+    """
+    FR : Rafraîchit `locked_at` des tâches en cours de `worker` (appelé par run_jobs toutes les
+         HEARTBEAT_INTERVAL secondes, y compris pour les tâches qui n'appellent pas report_progress()).
+         Retour : nombre de tâches rafraîchies.
+    EN : Refresh `locked_at` of `worker`'s running jobs (called by run_jobs every HEARTBEAT_INTERVAL
+         seconds, including for jobs that never call report_progress()).
+         Returns: number of refreshed jobs.
+    """
+    return Job.objects.filter(id__in=list(job_ids), status=Job.Status.RUNNING, locked_by=worker).update(
+        locked_at=timezone.now()
+    )
+
+
+def fail(job: Job, error: str) -> Job:
+    """
+    FR : Enregistre l'échec d'une tentative : nouvelle tentative avec backoff exponentiel, ou FAILED après
+         max_attempts. Retour : Job mis à jour.
+    EN : Record a failed attempt: retried with exponential backoff, or FAILED after max_attempts.
+         Returns: updated Job.
+    """
+    job.last_error = error
+    job.result = None
+    job.locked_by, job.locked_at = "", None
+    if job.attempts < job.max_attempts:
+        job.status = Job.Status.QUEUED
+        job.run_after = timezone.now() + timedelta(seconds=RETRY_BASE_DELAY * 2 ** (job.attempts - 1))
+        job.finished_at = None
+        logger.warning("Job %s failed (attempt %s/%s), retrying", job, job.attempts, job.max_attempts)
+    else:
+        job.status = Job.Status.FAILED
+        job.finished_at = timezone.now()
+        logger.error("Job %s failed permanently", job)
+    job.save(update_fields=["status", "run_after", "last_error", "result", "locked_by", "locked_at", "finished_at"])
+    return job
+
+
+def run(job: Job) -> Job:
+    """
+    FR : Exécute une tâche prise par claim() puis enregistre le résultat.
+         Une exception de la tâche ou de l'enregistrement du résultat (ex. résultat non sérialisable en JSON,
+         base verrouillée) est un échec de la tentative, voir fail().
+    EN : Run a job returned by claim() and record the outcome.
+         An exception from the task or from storing its result (e.g. result not JSON-serializable,
+         database locked) is a failed attempt, see fail().
+    """
+    func = TASKS.get(job.name)
+    try:
+        if func is None:
+            raise LookupError(f"Unknown task {job.name!r}")
+        result = func(job, **job.payload)
+        job.status = Job.Status.SUCCEEDED
+        job.result = result
+        job.finished_at = timezone.now()
+        job.locked_by, job.locked_at = "", None
+        # EN: Savepoint: a failed write must not break an enclosing transaction before fail() records it
+        # FR : Point de sauvegarde : une écriture ratée ne doit pas casser une transaction englobante avant fail()
+        with transaction.atomic():
+            job.save(update_fields=["status", "result", "finished_at", "locked_by", "locked_at"])
+    except Exception:
+        return fail(job, traceback.format_exc())
+    return job
+
+
+def run_by_id(job_id: int) -> str:
+    """
+    FR : Point d'entrée des pools de threads/processus : recharge la tâche et l'exécute. Retour : statut final.
+    EN : Entry point for thread/process pools: reload the job and run it. Returns: final status.
+    """
+    from django.db import connection
+
+    try:
+        return run(Job.objects.get(id=job_id)).status
+    finally:
+        # EN: Each pool thread/process owns its connection; release it between jobs
+        # FR : Chaque thread/processus du pool possède sa connexion ; la libérer entre deux tâches
+        connection.close()
+
+
+def requeue_stale(older_than: timedelta) -> tuple[int, int]:
+    """
+    FR : Traite les tâches RUNNING dont le verrou (rafraîchi par heartbeat()) est plus ancien que `older_than`
+         (worker mort) : remises en file, ou FAILED si elles ont épuisé max_attempts.
+         Retour : (nombre remis en file, nombre passé en FAILED).
+    EN : Handle RUNNING jobs whose lock (refreshed by heartbeat()) is older than `older_than` (dead worker):
+         requeued, or FAILED once they have used up max_attempts.
+         Returns: (number requeued, number failed).
+    """
+    now = timezone.now()
+    stale = Job.objects.filter(status=Job.Status.RUNNING, locked_at__lt=now - older_than)
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(
+        status=Job.Status.FAILED,
+        locked_by="",
+        locked_at=None,
+        finished_at=now,
+        last_error="Worker lost: lock expired after the last attempt",
+    )
+    requeued = stale.filter(attempts__lt=F("max_attempts")).update(
+        status=Job.Status.QUEUED, locked_by="", locked_at=None
+    )
+    if failed:
+        logger.error("%s stale job(s) failed permanently", failed)
+    return requeued, failed
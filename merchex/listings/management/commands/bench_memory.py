@@ -0,0 +1,145 @@
+"""
+Module: listings/management/commands/bench_memory.py
+
+EN: Peak-RSS benchmark of the listings page: full model instances vs streamed ListingRow objects.
+    Bilingual comments (EN/FR).
+FR : Benchmark du pic de RSS de la page des annonces : instances de modèle complètes vs ListingRow en flux.
+     Commentaires bilingues (EN/FR).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory, override_settings
+
+from listings.models import Listing
+from listings.rows import iter_listing_rows
+from listings.streaming import render_list
+
+
+# EN: "models" is the historical view (Listing.objects.all()), "rows" the buffered ListingRow page,
+#     "stream" the page streamed in chunks by render_list()
+# FR : "models" est la vue historique (Listing.objects.all()), "rows" la page tamponnée en ListingRow,
+#      "stream" la page envoyée en flux par morceaux par render_list()
+MODES = ("models", "rows", "stream")
+
+
+def peak_rss_mb() -> float:
+    """
+    FR : Pic de mémoire résidente du processus courant, en Mo (ru_maxrss : Ko sous Linux, octets sous macOS).
+    EN : Peak resident memory of the current process, in MB (ru_maxrss: KB on Linux, bytes on macOS).
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def use_database(path: str) -> None:
+    """
+    FR : Redirige la connexion par défaut vers une base SQLite jetable (la base de dev n'est jamais touchée).
+    EN : Point the default connection at a throwaway SQLite file (the dev database is never touched).
+    """
+    connection.close()
+    connection.settings_dict["NAME"] = path
+
+
+class Command(BaseCommand):
+    """
+    EN: `python manage.py bench_memory [--rows 1000000]`
+    FR : `python manage.py bench_memory [--rows 1000000]`
+    """
+
+    help = "Compare peak RSS of rendering the listings page from model instances, rows and streamed rows."
+
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000, help="Number of listings to seed.")
+        parser.add_argument("--database", help="Reuse an already seeded SQLite file instead of a temporary one.")
+        # EN: Internal: run one measurement in this (fresh) process
+        # FR : Interne : exécuter une mesure dans ce processus (neuf)
+        parser.add_argument("--worker", choices=MODES, help="Internal use.")
+
+    def handle(self, *args, **options):
+        if options["worker"]:
+            return self.run_worker(options["worker"], options["database"])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = options["database"] or os.path.join(tmp, "bench_memory.sqlite3")
+            if not options["database"]:
+                self.seed(path, options["rows"])
+
+            results = {mode: self.spawn(mode, path) for mode in MODES}
+
+        self.stdout.write(f"{results['models']['count']} listings rendered")
+        for mode, result in results.items():
+            self.stdout.write(
+                f"  {mode:<7} peak RSS {result['peak_rss_mb']:8.1f} MB"
+                f"  (baseline {result['baseline_rss_mb']:.1f} MB)  render {result['seconds']:.2f} s"
+            )
+        for mode in MODES[1:]:
+            saved = results["models"]["peak_rss_mb"] - results[mode]["peak_rss_mb"]
+            self.stdout.write(f"  {mode:<7} saves {saved:8.1f} MB")
+
+    def seed(self, path: str, rows: int) -> None:
+        """
+        FR : Crée le schéma et insère `rows` annonces (description de 400 caractères) par lots.
+        EN : Create the schema and insert `rows` listings (400-char descriptions) in batches.
+        """
+        use_database(path)
+        call_command("migrate", verbosity=0)
+        batch = 10_000
+        for start in range(0, rows, batch):
+            Listing.objects.bulk_create(
+                Listing(title=f"Listing {i}", description="d" * 400, type=Listing.Type.RECORDS)
+                for i in range(start, min(start + batch, rows))
+            )
+        connection.close()
+
+    def spawn(self, mode: str, path: str) -> dict:
+        """
+        FR : Lance une mesure dans un interpréteur neuf pour que les pics de RSS ne se mélangent pas.
+        EN : Run one measurement in a fresh interpreter so peak RSS values do not leak between modes.
+        """
+        proc = subprocess.run(
+            [sys.executable, "manage.py", "bench_memory", "--worker", mode, "--database", path],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            raise CommandError(f"{mode} worker failed:\n{proc.stderr[-2000:]}")
+        return json.loads(proc.stdout.strip().splitlines()[-1])
+
+    def run_worker(self, mode: str, path: str) -> None:
+        use_database(path)
+        baseline = peak_rss_mb()
+        items = Listing.objects.all() if mode == "models" else iter_listing_rows()
+        request = RequestFactory().get("/listings/")
+
+        start = time.perf_counter()
+        with override_settings(LIST_STREAMING=mode == "stream"):
+            response = render_list(request, "listings/listings.html", "listings/listing_rows.html", items)
+            # EN: Consume the stream chunk by chunk, as a WSGI server would
+            # FR : Consommer le flux morceau par morceau, comme un serveur WSGI
+            chunks = response.streaming_content if response.streaming else [response.content]
+            count = sum(chunk.count(b"<li>") for chunk in chunks)
+        seconds = time.perf_counter() - start
+
+        self.stdout.write(json.dumps({
+            "mode": mode,
+            "count": count,
+            "baseline_rss_mb": baseline,
+            "peak_rss_mb": peak_rss_mb(),
+            "seconds": seconds,
+        }))
@@ -0,0 +1,81 @@
+"""
+Module: listings/management/commands/bench_startup.py
+
+EN: Benchmark of a cold worker: entry-point import time and time-to-first-request. Bilingual comments (EN/FR).
+FR : Benchmark d'un worker à froid : temps d'import du point d'entrée et temps jusqu'à la première requête. Commentaires bilingues (EN/FR).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# EN: Script run in each fresh interpreter; it mimics a WSGI worker booting then serving one GET
+# FR : Script exécuté dans chaque interpréteur neuf ; il imite un worker WSGI qui démarre puis sert un GET
+WORKER_SCRIPT = """
+import io, json, sys, time
+t0 = time.perf_counter()
+from merchex.wsgi import application
+t1 = time.perf_counter()
+environ = {
+    "REQUEST_METHOD": "GET", "PATH_INFO": sys.argv[1], "QUERY_STRING": "",
+    "SERVER_NAME": "localhost", "SERVER_PORT": "80", "SERVER_PROTOCOL": "HTTP/1.1",
+    "wsgi.input": io.BytesIO(), "wsgi.url_scheme": "http", "wsgi.errors": sys.stderr,
+}
+status = []
+body = b"".join(application(environ, lambda s, h, exc_info=None: status.append(s)))
+t2 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "first_request": t2 - t1, "status": status[0], "bytes": len(body)}))
+"""
+
+
+class Command(BaseCommand):
+    """
+    EN: `python manage.py bench_startup [--path /bands/] [--runs 5]`
+    FR : `python manage.py bench_startup [--path /bands/] [--runs 5]`
+    """
+
+    help = "Measure per-worker import time and time-to-first-request in fresh interpreters."
+
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/about-us/", help="Path served as the first request.")
+        parser.add_argument("--runs", type=int, default=5, help="Number of fresh workers to start.")
+        parser.add_argument("--json", action="store_true", help="Print the raw per-run measurements as JSON.")
+
+    def handle(self, *args, **options):
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "merchex.settings")}
+        runs = []
+        for _ in range(options["runs"]):
+            proc = subprocess.run(
+                [sys.executable, "-c", WORKER_SCRIPT, options["path"]],
+                cwd=settings.BASE_DIR,
+                env=env,
+                capture_output=True,
+                text=True,
+            )
+            if proc.returncode != 0:
+                raise CommandError(f"Worker failed:\n{proc.stderr[-2000:]}")
+            runs.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+        if options["json"]:
+            self.stdout.write(json.dumps(runs, indent=2))
+            return
+
+        self.stdout.write(f"{len(runs)} cold workers, first request GET {options['path']} -> {runs[0]['status']}")
+        for key in ("import", "first_request"):
+            values = [run[key] * 1000 for run in runs]
+            self.stdout.write(
+                f"  {key:<14} min {min(values):7.1f} ms  median {statistics.median(values):7.1f} ms"
+                f"  max {max(values):7.1f} ms"
+            )
+        totals = [(run["import"] + run["first_request"]) * 1000 for run in runs]
+        self.stdout.write(f"  {'total':<14} min {min(totals):7.1f} ms  median {statistics.median(totals):7.1f} ms")
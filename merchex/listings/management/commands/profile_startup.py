@@ -0,0 +1,93 @@
+"""
+Module: listings/management/commands/profile_startup.py
+
+EN: Import-time breakdown of a worker's entry point (merchex.wsgi / merchex.asgi). Bilingual comments (EN/FR).
+FR : Décomposition du temps d'import du point d'entrée d'un worker (merchex.wsgi / merchex.asgi). Commentaires bilingues (EN/FR).
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# EN: Entry points a gunicorn/uvicorn worker imports on boot
+# FR : Points d'entrée importés par un worker gunicorn/uvicorn au démarrage
+TARGETS = {"wsgi": "merchex.wsgi", "asgi": "merchex.asgi"}
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """
+    FR : Analyse la sortie de `python -X importtime`.
+         Retour : liste de (module, temps propre µs, temps cumulé µs), dans l'ordre d'import.
+    EN : Parse the output of `python -X importtime`.
+         Returns: list of (module, self µs, cumulative µs), in import order.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+class Command(BaseCommand):
+    """
+    EN: `python manage.py profile_startup [--target asgi] [--limit 25]`
+    FR : `python manage.py profile_startup [--target asgi] [--limit 25]`
+    """
+
+    help = "Profile the import time of merchex.wsgi / merchex.asgi in a fresh interpreter."
+
+    # EN: No system checks: the profiling happens in a separate interpreter anyway
+    # FR : Pas de vérifications système : le profilage a lieu dans un autre interpréteur
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--target", choices=sorted(TARGETS), default="wsgi")
+        parser.add_argument("--limit", type=int, default=25, help="Number of modules/packages to show.")
+
+    def handle(self, *args, **options):
+        module = TARGETS[options["target"]]
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "merchex.settings")}
+
+        # EN: A fresh interpreter is required: in this process everything is already imported
+        # FR : Un interpréteur neuf est nécessaire : dans ce processus tout est déjà importé
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            raise CommandError(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+
+        rows = parse_importtime(proc.stderr)
+        if not rows:
+            raise CommandError("No import timings were captured.")
+
+        total_us = sum(self_us for _, self_us, _ in rows)
+
+        # EN: Self time aggregated per top-level package (django, listings, email, ...)
+        # FR : Temps propre agrégé par paquet de premier niveau (django, listings, email, ...)
+        per_package = defaultdict(int)
+        for name, self_us, _ in rows:
+            per_package[name.split(".")[0]] += self_us
+
+        limit = options["limit"]
+        self.stdout.write(f"Import of {module}: {total_us / 1000:.1f} ms, {len(rows)} modules\n")
+
+        self.stdout.write(f"Top {limit} packages (self time):")
+        for package, self_us in sorted(per_package.items(), key=lambda kv: kv[1], reverse=True)[:limit]:
+            self.stdout.write(f"  {self_us / 1000:9.1f} ms  {package}")
+
+        self.stdout.write(f"\nTop {limit} modules (cumulative time):")
+        for name, _, cumulative_us in sorted(rows, key=lambda row: row[2], reverse=True)[:limit]:
+            self.stdout.write(f"  {cumulative_us / 1000:9.1f} ms  {name}")
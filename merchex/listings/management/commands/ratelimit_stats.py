@@ -0,0 +1,37 @@
+"""
+Module: listings/management/commands/ratelimit_stats.py
+
+EN: Print the number of requests rejected by the rate limiter, per route. Bilingual comments (EN/FR).
+FR : Affiche le nombre de requêtes rejetées par le limiteur de débit, par route. Commentaires bilingues (EN/FR).
+"""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+# EN: Importing the views registers every @ratelimit scope
+# FR : Importer les vues enregistre toutes les portées @ratelimit
+import listings.views  # noqa: F401
+from listings.ratelimit import is_process_local, rejection_counts
+
+
+class Command(BaseCommand):
+    """
+    EN: `python manage.py ratelimit_stats`
+    FR : `python manage.py ratelimit_stats`
+    """
+
+    help = "Show rate-limit rejections (HTTP 429) per route, read from the rate-limit cache."
+
+    requires_system_checks = []
+
+    def handle(self, *args, **options):
+        # EN: A process-local cache only holds the counters of the process that served the requests
+        # FR : Un cache local au processus ne contient que les compteurs du processus qui a servi les requêtes
+        if is_process_local():
+            raise CommandError(
+                "RATELIMIT_CACHE is a per-process LocMemCache: this command cannot see the workers' counters. "
+                "Use a shared cache backend, or read /ratelimit-stats/ on a running worker."
+            )
+        for scope, count in rejection_counts().items():
+            self.stdout.write(f"{scope:<20} {count}")
@@ -0,0 +1,143 @@
+"""
+Module: listings/management/commands/run_jobs.py
+
+EN: Worker for the database-backed job queue (listings/jobs.py), on a thread or process pool.
+    Bilingual comments (EN/FR).
+FR : Worker de la file de tâches stockée en base (listings/jobs.py), sur un pool de threads ou de processus.
+     Commentaires bilingues (EN/FR).
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import socket
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from django.utils.module_loading import autodiscover_modules
+
+from listings import job_process, jobs
+from listings.models import Job
+
+
+class Command(BaseCommand):
+    """
+    EN: `python manage.py run_jobs [--workers 4] [--processes] [--burst] [--status]`
+    FR : `python manage.py run_jobs [--workers 4] [--processes] [--burst] [--status]`
+    """
+
+    help = "Run queued background jobs (priorities, retries, progress) with only the project database."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4, help="Number of jobs run concurrently.")
+        parser.add_argument("--processes", action="store_true", help="Use a process pool instead of threads.")
+        parser.add_argument("--burst", action="store_true", help="Exit once the queue is empty.")
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between queue polls.")
+        parser.add_argument(
+            "--stale-after", type=int, default=3600,
+            help="Requeue RUNNING jobs whose lock was not refreshed for this many seconds (crashed workers).",
+        )
+        parser.add_argument("--status", action="store_true", help="Print the queue summary and exit.")
+
+    def handle(self, *args, **options):
+        if options["status"]:
+            return self.print_status()
+
+        autodiscover_modules("tasks")
+        worker = f"{socket.gethostname()}:{os.getpid()}"
+        requeued, failed = jobs.requeue_stale(timedelta(seconds=options["stale_after"]))
+        if requeued or failed:
+            self.stdout.write(f"Requeued {requeued} stale job(s), {failed} failed after max attempts")
+
+        size = options["workers"]
+        executor, run_by_id = self.make_executor(size, options["processes"])
+        self.stdout.write(f"Worker {worker} started ({size} {'processes' if options['processes'] else 'threads'})")
+        running = {}
+        last_heartbeat = time.monotonic()
+        try:
+            while True:
+                # EN: Fill free slots; the claim happens here so the pool only runs claimed jobs
+                # FR : Remplir les places libres ; la prise se fait ici, le pool n'exécute que des tâches prises
+                while len(running) < size and (job := jobs.claim(worker)) is not None:
+                    running[executor.submit(run_by_id, job.id)] = job
+
+                if not running:
+                    if options["burst"]:
+                        break
+                    time.sleep(options["poll_interval"])
+                    continue
+
+                # EN: Keep the locks of running jobs fresh so requeue_stale() never steals them
+                # FR : Garder frais les verrous des tâches en cours pour que requeue_stale() ne les vole pas
+                if time.monotonic() - last_heartbeat >= jobs.HEARTBEAT_INTERVAL:
+                    jobs.heartbeat(worker, (job.id for job in running.values()))
+                    last_heartbeat = time.monotonic()
+
+                done, _ = wait(running, timeout=options["poll_interval"], return_when=FIRST_COMPLETED)
+                broken = False
+                for future in done:
+                    job = running.pop(future)
+                    try:
+                        self.stdout.write(f"{job.name} #{job.id}: {future.result()}")
+                    except Exception as exc:
+                        # EN: The pool itself failed (e.g. a child process died): fail this attempt, keep going
+                        # FR : Le pool lui-même a échoué (ex. processus enfant mort) : échec de la tentative, on continue
+                        self.record_failure(job, exc)
+                        broken = broken or isinstance(exc, BrokenExecutor)
+                if broken:
+                    # EN: A broken pool fails every pending job; replace it
+                    # FR : Un pool cassé fait échouer toutes les tâches en attente ; le remplacer
+                    for future, job in running.items():
+                        if future.done() and future.exception() is None:
+                            continue
+                        self.record_failure(job, future.exception() if future.done() else BrokenExecutor())
+                    running.clear()
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    executor, run_by_id = self.make_executor(size, options["processes"])
+        except KeyboardInterrupt:
+            # EN: Jobs still RUNNING are requeued by the next worker after --stale-after
+            # FR : Les tâches encore RUNNING sont remises en file par le prochain worker après --stale-after
+            self.stdout.write("Interrupted")
+        finally:
+            executor.shutdown()
+
+    def make_executor(self, size: int, processes: bool):
+        """
+        FR : Pool de threads ou de processus et son point d'entrée. Retour : (executor, run_by_id).
+        EN : Thread or process pool and its entry point. Returns: (executor, run_by_id).
+        """
+        if processes:
+            # EN: "spawn" so children never inherit the parent's database connection
+            # FR : "spawn" pour que les enfants n'héritent jamais de la connexion du parent
+            executor = ProcessPoolExecutor(
+                size, mp_context=multiprocessing.get_context("spawn"), initializer=job_process.init
+            )
+            return executor, job_process.run_by_id
+        return ThreadPoolExecutor(size, thread_name_prefix="run_jobs"), jobs.run_by_id
+
+    def record_failure(self, job, exc) -> None:
+        """
+        FR : Journalise une erreur du pool et l'enregistre comme échec de la tentative (voir jobs.fail()).
+             Si même cet enregistrement échoue, la tâche reste RUNNING et sera reprise après --stale-after.
+        EN : Log a pool error and record it as a failed attempt (see jobs.fail()).
+             If even that write fails, the job stays RUNNING and is picked up again after --stale-after.
+        """
+        self.stderr.write(f"{job.name} #{job.id}: {exc!r}")
+        try:
+            jobs.fail(job, "".join(traceback.format_exception(exc)))
+        except Exception as error:
+            self.stderr.write(f"{job.name} #{job.id}: could not record the failure: {error!r}")
+
+    def print_status(self):
+        counts = dict(Job.objects.values_list("status").annotate(n=Count("id")).values_list("status", "n"))
+        for status in Job.Status:
+            self.stdout.write(f"{status.label:<10} {counts.get(status.value, 0)}")
+        for job in Job.objects.filter(status=Job.Status.RUNNING).order_by("locked_at"):
+            self.stdout.write(
+                f"  {job}: {job.progress_done}/{job.progress_total} {job.progress_message} ({job.locked_by})"
+            )
@@ -0,0 +1,99 @@
+"""
+Module: listings/middleware.py
+
+EN: Fast path for anonymous GET/HEAD requests to read-only pages. Bilingual comments (EN/FR).
+FR : Chemin rapide pour les requêtes GET/HEAD anonymes vers les pages en lecture seule. Commentaires bilingues (EN/FR).
+"""
+
+from __future__ import annotations
+
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.middleware.csrf import CsrfViewMiddleware
+from django.urls import Resolver404, resolve
+from django.utils.cache import patch_cache_control
+from django.utils.deprecation import MiddlewareMixin
+
+
+# EN: Request attribute set when the fast path applies
+# FR : Attribut de requête positionné quand le chemin rapide s'applique
+FAST_PATH_ATTR = "anonymous_read_only"
+
+
+class AnonymousReadOnlyMiddleware(MiddlewareMixin):
+    """
+    FR : Détecte les GET/HEAD sans cookie de session vers une vue marquée @anonymous_read_only.
+         Doit être placé avant les middlewares session/CSRF/auth/messages (qui sont alors sautés).
+         Retour : réponse avec Cache-Control public et sans Vary: Cookie.
+    EN : Detect GET/HEAD requests without a session cookie to a view marked @anonymous_read_only.
+         Must come before the session/CSRF/auth/messages middleware (which are then skipped).
+         Returns: response with public Cache-Control and no Vary: Cookie.
+    """
+
+    def process_request(self, request):
+        if request.method not in ("GET", "HEAD") or settings.SESSION_COOKIE_NAME in request.COOKIES:
+            return None
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return None
+        if getattr(match.func, "anonymous_read_only", False):
+            setattr(request, FAST_PATH_ATTR, True)
+            # EN: Views and context processors still find a user, without any session lookup
+            # FR : Les vues et context processors trouvent toujours un utilisateur, sans lecture de session
+            request.user = AnonymousUser()
+        return None
+
+    def process_response(self, request, response):
+        if getattr(request, FAST_PATH_ATTR, False) and response.status_code == 200 and not response.cookies:
+            patch_cache_control(response, public=True, max_age=settings.ANONYMOUS_READ_ONLY_MAX_AGE)
+        return response
+
+
+class _SkipOnFastPathMixin:
+    """
+    FR : Court-circuite le middleware (requête et réponse) pour les requêtes du chemin rapide.
+    EN : Bypass the middleware (request and response phases) for fast-path requests.
+    """
+
+    def __call__(self, request):
+        if getattr(request, FAST_PATH_ATTR, False):
+            # EN: In async mode this returns the coroutine, which the handler awaits
+            # FR : En mode async, renvoie la coroutine, attendue par le handler
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+# ===============================================
+#  Fast-path aware middleware / Middlewares adaptés
+# ===============================================
+
+class FastPathSessionMiddleware(_SkipOnFastPathMixin, SessionMiddleware):
+    """
+    EN: SessionMiddleware that never touches the session (nor adds Vary: Cookie) on the fast path.
+    FR : SessionMiddleware qui ne touche jamais la session (ni n'ajoute Vary: Cookie) sur le chemin rapide.
+    """
+
+
+class FastPathCsrfViewMiddleware(_SkipOnFastPathMixin, CsrfViewMiddleware):
+    """
+    EN: CsrfViewMiddleware that neither reads nor rotates the CSRF cookie on the fast path.
+    FR : CsrfViewMiddleware qui ne lit ni ne renouvelle le cookie CSRF sur le chemin rapide.
+    """
+
+
+class FastPathAuthenticationMiddleware(_SkipOnFastPathMixin, AuthenticationMiddleware):
+    """
+    EN: AuthenticationMiddleware skipped on the fast path (request.user is already AnonymousUser).
+    FR : AuthenticationMiddleware sauté sur le chemin rapide (request.user est déjà AnonymousUser).
+    """
+
+
+class FastPathMessageMiddleware(_SkipOnFastPathMixin, MessageMiddleware):
+    """
+    EN: MessageMiddleware skipped on the fast path (the messages context processor then yields nothing).
+    FR : MessageMiddleware sauté sur le chemin rapide (le context processor messages ne renvoie alors rien).
+    """
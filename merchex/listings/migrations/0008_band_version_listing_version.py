@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0007_change'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='band',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='listing',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0008_band_version_listing_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Ranking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=30)),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('object_id', models.BigIntegerField()),
+                ('score', models.BigIntegerField()),
+                ('computed_at', models.DateTimeField()),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'rank'), name='listings_ranking_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ViewBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('bucket', models.DateTimeField()),
+                ('views', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['model', 'bucket'], name='listings_viewbucket_window_idx')],
+                'constraints': [models.UniqueConstraint(fields=('model', 'object_id', 'bucket'), name='listings_viewbucket_unique')],
+            },
+        ),
+    ]
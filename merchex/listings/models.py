@@ -7,14 +7,134 @@ from __future__ import annotations
 
 # EN: Import Django ORM base classes and field validators
 # FR : Importation des classes de base de l'ORM Django et des validateurs de champs
-from django.db import models
+from django.db import DatabaseError, models, router, transaction
+from django.db.models import F
+from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 
+# EN: Object cache invalidated on bulk updates (it does not import models, no cycle)
+# FR : Cache d'objets invalidé lors des mises à jour en masse (il n'importe pas les modèles, pas de cycle)
+from listings import objectcache
+
+
+# =============================================
+#  Change-tracking queryset / Queryset journalisé
+# =============================================
+class ChangeLogQuerySet(models.QuerySet):
+    """
+    FR : QuerySet qui journalise aussi les chemins « bulk » sans signaux (update, bulk_create, bulk_update)
+         dans le journal des changements (modèle Change). save()/delete() passent par listings/signals.py.
+    EN : QuerySet that also logs the signal-less bulk paths (update, bulk_create, bulk_update)
+         to the change log (Change model) and bumps `version` of versioned models.
+         save()/delete() go through listings/signals.py.
+    """
+
+    def update(self, **kwargs):
+        # EN: A bulk write is a new version too, or an edit form opened earlier would silently overwrite it
+        #     (save_changed_fields() already passes its own version = version + 1)
+        # FR : Une écriture en masse est aussi une nouvelle version, sinon un formulaire ouvert avant l'écraserait
+        #      silencieusement (save_changed_fields() passe déjà son propre version = version + 1)
+        if issubclass(self.model, VersionedModel) and "version" not in kwargs:
+            kwargs["version"] = F("version") + 1
+        with transaction.atomic(using=self.db):
+            ids = list(self.values_list("pk", flat=True))
+            rows = super().update(**kwargs)
+            Change.record_bulk(self.model, ids, Change.Action.UPDATE)
+            objectcache.invalidate_on_commit(self.model, ids, self.db)
+        return rows
+
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            Change.record_instances(objs, Change.Action.CREATE)
+        return objs
+
+    # EN: bulk_update() is not overridden: Django runs it as filter(pk__in=...).update(), logged above
+    # FR : bulk_update() n'est pas surchargé : Django l'exécute via filter(pk__in=...).update(), journalisé ci-dessus
+
+
+class ChangeLoggedModel(models.Model):
+    """
+    FR : Base abstraite des modèles journalisés : manager ChangeLogQuerySet et save() atomique, pour que la
+         ligne et son entrée de journal (signal post_save) soient validées ensemble.
+    EN : Abstract base of logged models: ChangeLogQuerySet manager and atomic save(), so the row and its
+         log entry (post_save signal) are committed together.
+    """
+
+    objects = ChangeLogQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get("using") or router.db_for_write(type(self), instance=self)):
+            super().save(*args, **kwargs)
+
+
+class VersionConflict(DatabaseError):
+    """
+    FR : Levée par VersionedModel.save() quand la ligne a été modifiée depuis la lecture de l'instance
+         (version différente) : rien n'est écrit.
+    EN : Raised by VersionedModel.save() when the row changed since the instance was read
+         (different version): nothing is written.
+    """
+
+
+class VersionedModel(models.Model):
+    """
+    FR : Base abstraite pour le contrôle de concurrence optimiste : `version` est incrémentée à chaque écriture.
+         Les vues d'édition écrivent via listings/concurrency.py (UPDATE ... WHERE version = N) ;
+         save() (admin, shell) fait le même UPDATE conditionnel et lève VersionConflict si la ligne a changé.
+    EN : Abstract base for optimistic concurrency control: `version` is incremented on every write.
+         Edit views write through listings/concurrency.py (UPDATE ... WHERE version = N);
+         save() (admin, shell) runs the same conditional UPDATE and raises VersionConflict if the row moved on.
+    """
+
+    # EN: Row version, starts at 0
+    # FR : Version de la ligne, commence à 0
+    version = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "version"}
+        super().save(*args, **kwargs)
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        """
+        FR : UPDATE ... SET version = version + 1 WHERE pk = ... AND version = <version lue>.
+             `self.version` n'est incrémentée qu'après une écriture réussie.
+             Erreurs : VersionConflict si la ligne existe avec une autre version.
+        EN : UPDATE ... SET version = version + 1 WHERE pk = ... AND version = <version read>.
+             `self.version` is only bumped once the write succeeded.
+             Errors: VersionConflict if the row exists with another version.
+        """
+        if self._state.adding:
+            return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+        expected = self.version
+        values = [
+            (field, model, F("version") + 1 if field.attname == "version" else value)
+            for field, model, value in values
+        ]
+        updated = super()._do_update(
+            base_qs.filter(version=expected), using, pk_val, values, update_fields, forced_update
+        )
+        if not updated:
+            if base_qs.filter(pk=pk_val).exists():
+                raise VersionConflict(f"{self._meta.label} {pk_val} changed since version {expected}")
+            # EN: Row deleted meanwhile: Django's usual fallback (INSERT) applies
+            # FR : Ligne supprimée entre-temps : le repli habituel de Django (INSERT) s'applique
+            return False
+        self.version = expected + 1
+        return True
+
 
 # ===============================
 #  Band model / Modèle de groupe
 # ===============================
-class Band(models.Model):
+class Band(ChangeLoggedModel, VersionedModel):
     """
     FR : Représente un groupe de musique (genre, biographie, statut d'activité, site officiel).
          Préconditions : aucune. Champs clés : name, genre, year_formed, active, official_page.
@@ -75,7 +195,7 @@ class Band(models.Model):
 # ====================================
 #  Listing model / Modèle d'annonce
 # ====================================
-class Listing(models.Model):
+class Listing(ChangeLoggedModel, VersionedModel):
     """
     FR : Représente une annonce de merchandising (disques, vêtements, posters, etc.).
          Préconditions : aucune. Champs clés : title, description, sold, year, official_page, type, band.
@@ -135,3 +255,251 @@ class Listing(models.Model):
         EN : Human-readable representation (admin, shell). Returns: "title (human-readable type)".
         """
         return f"{self.title} ({self.get_type_display()})"
+
+
+# ====================================
+#  Job model / Modèle de tâche de fond
+# ====================================
+class Job(models.Model):
+    """
+    FR : Tâche de fond persistée en base (file d'attente sans broker), exécutée par `manage.py run_jobs`.
+         Préconditions : `name` correspond à une tâche enregistrée avec @task (listings/jobs.py).
+         Champs clés : name, payload, status, priority, attempts, idempotency_key, progress.
+         Erreurs : IntegrityError si idempotency_key est déjà utilisée (géré par enqueue()).
+    EN : Background job persisted in the database (broker-less queue), run by `manage.py run_jobs`.
+         Preconditions: `name` matches a task registered with @task (listings/jobs.py).
+         Key fields: name, payload, status, priority, attempts, idempotency_key, progress.
+         Errors: IntegrityError if idempotency_key is already used (handled by enqueue()).
+    """
+
+    # EN: Inner class for the job lifecycle
+    # FR : Classe interne pour le cycle de vie d'une tâche
+    class Status(models.TextChoices):
+        QUEUED = "Q", "Queued"
+        RUNNING = "R", "Running"
+        SUCCEEDED = "S", "Succeeded"
+        FAILED = "F", "Failed"
+
+    # EN: Registered task name, e.g. "listings.export_listings"
+    # FR : Nom de la tâche enregistrée, ex. "listings.export_listings"
+    name = models.CharField(max_length=100)
+
+    # EN: Keyword arguments passed to the task (JSON)
+    # FR : Arguments nommés passés à la tâche (JSON)
+    payload = models.JSONField(default=dict, blank=True)
+
+    # EN: Current state (queued by default)
+    # FR : État courant (en attente par défaut)
+    status = models.CharField(choices=Status.choices, max_length=1, default=Status.QUEUED)
+
+    # EN: Higher priority jobs run first
+    # FR : Les tâches de plus haute priorité passent en premier
+    priority = models.IntegerField(default=0)
+
+    # EN: Optional deduplication key: enqueuing twice with the same key returns the existing job
+    # FR : Clé de déduplication optionnelle : deux mises en file avec la même clé renvoient la même tâche
+    idempotency_key = models.CharField(max_length=200, null=True, blank=True, unique=True)
+
+    # EN: Attempts made so far, and the maximum before the job is marked failed
+    # FR : Tentatives effectuées, et maximum avant que la tâche soit marquée en échec
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+
+    # EN: The job is not picked up before this time (used for retry backoff)
+    # FR : La tâche n'est pas prise avant cette date (utilisé pour le délai entre tentatives)
+    run_after = models.DateTimeField(default=timezone.now)
+
+    # EN: Progress reported by the task (done / total) with a short message
+    # FR : Progression rapportée par la tâche (done / total) avec un court message
+    progress_done = models.PositiveIntegerField(default=0)
+    progress_total = models.PositiveIntegerField(default=0)
+    progress_message = models.CharField(max_length=200, blank=True, default="")
+
+    # EN: Worker holding the job and since when (stale locks are recovered by the worker)
+    # FR : Worker qui détient la tâche et depuis quand (les verrous périmés sont récupérés par le worker)
+    locked_by = models.CharField(max_length=100, blank=True, default="")
+    locked_at = models.DateTimeField(null=True, blank=True)
+
+    # EN: Task return value (JSON) and last error traceback
+    # FR : Valeur de retour de la tâche (JSON) et trace de la dernière erreur
+    result = models.JSONField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        # EN: Serves the worker's "next job" query
+        # FR : Sert la requête « prochaine tâche » du worker
+        indexes = [models.Index(fields=["status", "priority", "run_after"], name="listings_job_next_idx")]
+
+    def __str__(self) -> str:
+        """
+        FR : Représentation lisible (admin, shell). Retour : « name #id (statut lisible) ».
+        EN : Human-readable representation (admin, shell). Returns: "name #id (human-readable status)".
+        """
+        return f"{self.name} #{self.id} ({self.get_status_display()})"
+
+
+# ==========================================
+#  Change log / Journal des changements
+# ==========================================
+class Change(models.Model):
+    """
+    FR : Entrée du journal append-only des créations/modifications/suppressions de Band et Listing (outbox).
+         `seq` croît strictement : un consommateur lit « changements depuis N » en O(changements).
+         Préconditions : alimenté par listings/signals.py et ChangeLogQuerySet, jamais modifié ensuite.
+         Champs clés : seq, model, object_id, action, data (instantané des champs, None pour une suppression).
+    EN : Entry of the append-only log of Band and Listing creates/updates/deletes (outbox).
+         `seq` is strictly increasing: a consumer reads "changes since N" at O(changes).
+         Preconditions: written by listings/signals.py and ChangeLogQuerySet, never modified afterwards.
+         Key fields: seq, model, object_id, action, data (field snapshot, None for a delete).
+    """
+
+    # EN: Inner class for the kind of mutation
+    # FR : Classe interne pour le type de mutation
+    class Action(models.TextChoices):
+        CREATE = "C", "Create"
+        UPDATE = "U", "Update"
+        DELETE = "D", "Delete"
+
+    # EN: Sequence number (primary key, monotonic)
+    # FR : Numéro de séquence (clé primaire, monotone)
+    seq = models.BigAutoField(primary_key=True)
+
+    # EN: Model name ("band" or "listing") and primary key of the changed row
+    # FR : Nom du modèle ("band" ou "listing") et clé primaire de la ligne modifiée
+    model = models.CharField(max_length=20)
+    object_id = models.BigIntegerField()
+
+    action = models.CharField(choices=Action.choices, max_length=1)
+
+    # EN: Snapshot of the row after the change (attname -> value)
+    # FR : Instantané de la ligne après le changement (attname -> valeur)
+    data = models.JSONField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        """
+        FR : Représentation lisible. Retour : « #seq action model:object_id ».
+        EN : Human-readable representation. Returns: "#seq action model:object_id".
+        """
+        return f"#{self.seq} {self.get_action_display()} {self.model}:{self.object_id}"
+
+    @staticmethod
+    def snapshot(instance) -> dict:
+        """
+        FR : Valeurs des champs concrets d'une instance (clés étrangères en id).
+        EN : Concrete field values of an instance (foreign keys as ids).
+        """
+        return {field.attname: getattr(instance, field.attname) for field in instance._meta.concrete_fields}
+
+    @classmethod
+    def record(cls, instance, action: str) -> None:
+        """
+        FR : Journalise un changement d'une instance (signaux save/delete).
+        EN : Log one instance change (save/delete signals).
+        """
+        cls.objects.create(
+            model=instance._meta.model_name,
+            object_id=instance.pk,
+            action=action,
+            data=None if action == cls.Action.DELETE else cls.snapshot(instance),
+        )
+
+    @classmethod
+    def record_instances(cls, instances, action: str) -> None:
+        """
+        FR : Journalise un lot d'instances en un seul INSERT (bulk_create).
+        EN : Log a batch of instances with a single INSERT (bulk_create).
+        """
+        cls.objects.bulk_create(
+            cls(model=obj._meta.model_name, object_id=obj.pk, action=action, data=cls.snapshot(obj))
+            for obj in instances
+            if obj.pk is not None
+        )
+
+    @classmethod
+    def record_bulk(cls, model, ids, action: str, overrides: dict | None = None) -> None:
+        """
+        FR : Journalise des lignes identifiées par leurs ids ; l'instantané est relu en base (QuerySet.update())
+             puis complété par `overrides` (valeurs pas encore écrites, ex. SET_NULL).
+        EN : Log rows identified by their ids; the snapshot is re-read from the database (QuerySet.update())
+             then patched with `overrides` (values not written yet, e.g. SET_NULL).
+        """
+        attnames = [field.attname for field in model._meta.concrete_fields]
+        # EN: Chunked to stay under SQLite's bound-parameter limit
+        # FR : Par paquets pour rester sous la limite de paramètres de SQLite
+        for start in range(0, len(ids), 500):
+            rows = model._base_manager.filter(pk__in=ids[start:start + 500]).values(*attnames)
+            cls.objects.bulk_create(
+                cls(model=model._meta.model_name, object_id=row["id"], action=action, data={**row, **(overrides or {})})
+                for row in rows
+            )
+
+
+# ==============================================
+#  Popularity / Popularité (compteurs de vues)
+# ==============================================
+class ViewBucket(models.Model):
+    """
+    FR : Nombre de vues d'une page de détail (band/listing) sur une tranche horaire.
+         Écrit uniquement par lots (upsert) depuis les compteurs en mémoire de listings/popularity.py.
+         Champs clés : model, object_id, bucket (début de l'heure), views.
+    EN : Number of detail-page views (band/listing) in one hourly bucket.
+         Only written in batches (upsert) from the in-memory counters of listings/popularity.py.
+         Key fields: model, object_id, bucket (start of the hour), views.
+    """
+
+    model = models.CharField(max_length=20)
+    object_id = models.BigIntegerField()
+
+    # EN: Start of the hour (UTC) the views belong to
+    # FR : Début de l'heure (UTC) à laquelle appartiennent les vues
+    bucket = models.DateTimeField()
+
+    views = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["model", "object_id", "bucket"], name="listings_viewbucket_unique"),
+        ]
+        # EN: Serves the "views in the last N hours" aggregation of trending rankings
+        # FR : Sert l'agrégation « vues des N dernières heures » des classements tendances
+        indexes = [models.Index(fields=["model", "bucket"], name="listings_viewbucket_window_idx")]
+
+    def __str__(self) -> str:
+        """
+        FR : Représentation lisible. Retour : « model:object_id @ bucket = views ».
+        EN : Human-readable representation. Returns: "model:object_id @ bucket = views".
+        """
+        return f"{self.model}:{self.object_id} @ {self.bucket:%Y-%m-%d %H:00} = {self.views}"
+
+
+
+class Ranking(models.Model):
+    """
+    FR : Classement top-N précalculé (ex. « most_viewed_listings », « trending_bands »), reconstruit par la
+         tâche de fond listings.rebuild_rankings ; les pages de classement ne lisent que cette table.
+         Champs clés : kind, rank (1 = premier), object_id, score.
+    EN : Precomputed top-N ranking (e.g. "most_viewed_listings", "trending_bands"), rebuilt by the
+         listings.rebuild_rankings background job; ranking pages only read this table.
+         Key fields: kind, rank (1 = first), object_id, score.
+    """
+
+    kind = models.CharField(max_length=30)
+    rank = models.PositiveSmallIntegerField()
+    object_id = models.BigIntegerField()
+    score = models.BigIntegerField()
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["kind", "rank"], name="listings_ranking_unique")]
+
+    def __str__(self) -> str:
+        """
+        FR : Représentation lisible. Retour : « kind #rank: object_id (score) ».
+        EN : Human-readable representation. Returns: "kind #rank: object_id (score)".
+        """
+        return f"{self.kind} #{self.rank}: {self.object_id} ({self.score})"
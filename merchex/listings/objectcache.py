@@ -0,0 +1,198 @@
+"""
+Module: listings/objectcache.py
+
+EN: Two-tier cache of model instances by primary key: in-process LRU (bounded, TTL) in front of the shared
+    Django cache, with version-based invalidation on save/delete. Bilingual comments (EN/FR).
+FR : Cache à deux niveaux d'instances par clé primaire : LRU en mémoire du processus (borné, TTL) devant le
+     cache Django partagé, avec invalidation par version à l'enregistrement/suppression. Commentaires bilingues (EN/FR).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import Http404
+
+
+class LRUCache:
+    """
+    FR : LRU borné avec expiration (TTL), sûr entre threads. Les valeurs sont partagées : les traiter en lecture seule.
+    EN : Bounded LRU with expiry (TTL), thread-safe. Values are shared: treat them as read-only.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, stats: Counter):
+        self.maxsize, self.ttl, self.stats = maxsize, ttl, stats
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                self.stats["l1_expired"] += 1
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.stats["l1_evictions"] += 1
+
+    def discard(self, key) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# EN: Per-process statistics (hits per tier, misses, evictions, invalidations)
+# FR : Statistiques par processus (succès par niveau, échecs, évictions, invalidations)
+_stats: Counter = Counter()
+_l1 = LRUCache(settings.OBJECT_CACHE_L1_SIZE, settings.OBJECT_CACHE_L1_TTL, _stats)
+
+
+def _shared():
+    return caches[settings.OBJECT_CACHE_ALIAS]
+
+
+def _label(model) -> str:
+    return model._meta.label_lower
+
+
+def _generation_key(model, pk) -> str:
+    return f"objcache:gen:{_label(model)}:{pk}"
+
+
+def _generation_ttl() -> int:
+    # EN: Finite, and longer than any entry stored under the generation; an expired generation is simply
+    #     recreated from a fresh timestamp, so no older entry is ever reused
+    # FR : Finie, et plus longue que toute entrée stockée sous la génération ; une génération expirée est
+    #      simplement recréée à partir d'un nouvel horodatage, aucune ancienne entrée n'est donc réutilisée
+    return 2 * settings.OBJECT_CACHE_L2_TTL
+
+
+def get(model, pk):
+    """
+    FR : Instance `model` de clé `pk` : LRU local (0 requête), puis cache partagé (0 requête), puis base.
+         La version de l'objet (génération) n'est créée dans le cache partagé qu'après un chargement réussi :
+         les clés inexistantes (404) n'y laissent aucune trace.
+         Préconditions : l'instance renvoyée est partagée, ne pas la modifier (les vues d'édition lisent la base).
+         Retour : instance ou None si elle n'existe pas.
+    EN : `model` instance with key `pk`: local LRU (0 queries), then shared cache (0 queries), then database.
+         The object's version (generation) is only created in the shared cache after a successful load:
+         missing keys (404s) leave nothing behind.
+         Preconditions: the returned instance is shared, do not mutate it (edit views read the database).
+         Returns: instance, or None if it does not exist.
+    """
+    l1_key = (_label(model), pk)
+    obj = _l1.get(l1_key)
+    if obj is not None:
+        _stats["l1_hits"] += 1
+        return obj
+
+    cache = _shared()
+    gen_key = _generation_key(model, pk)
+    generation = cache.get(gen_key)
+    if generation is not None:
+        obj = cache.get(f"objcache:obj:{_label(model)}:{pk}:{generation}")
+        if obj is not None:
+            _stats["l2_hits"] += 1
+            _l1.set(l1_key, obj)
+            return obj
+
+    _stats["misses"] += 1
+    # EN: Timestamp taken before the read, so a generation created from it can never predate the data
+    # FR : Horodatage pris avant la lecture : une génération créée à partir de lui ne précède jamais les données
+    fresh = int(time.time() * 1000)
+    obj = model._default_manager.filter(pk=pk).first()
+    if obj is None:
+        return None
+    if generation is None and not cache.add(gen_key, fresh, timeout=_generation_ttl()):
+        # EN: Another worker (or an invalidation) set the generation meanwhile: our copy may be stale, do not cache it
+        # FR : Un autre worker (ou une invalidation) a posé la génération entre-temps : notre copie peut être
+        #      périmée, ne pas la mettre en cache
+        return obj
+    cache.set(
+        f"objcache:obj:{_label(model)}:{pk}:{generation if generation is not None else fresh}",
+        obj,
+        timeout=settings.OBJECT_CACHE_L2_TTL,
+    )
+    _l1.set(l1_key, obj)
+    return obj
+
+
+def get_or_404(model, pk):
+    """
+    FR : Comme get_object_or_404(model, pk=pk), via le cache. Erreurs : Http404 si absent.
+    EN : Like get_object_or_404(model, pk=pk), through the cache. Errors: Http404 when missing.
+    """
+    obj = get(model, pk)
+    if obj is None:
+        raise Http404(f"No {model._meta.object_name} matches the given query.")
+    return obj
+
+
+def invalidate(model, pks) -> None:
+    """
+    FR : Invalide des objets : nouvelle version dans le cache partagé (tous les workers) et retrait du LRU local.
+         Les LRU des autres workers expirent au plus tard après OBJECT_CACHE_L1_TTL secondes.
+    EN : Invalidate objects: new version in the shared cache (all workers) and removal from the local LRU.
+         Other workers' LRUs expire at the latest after OBJECT_CACHE_L1_TTL seconds.
+    """
+    cache = _shared()
+    label = _label(model)
+    for pk in pks:
+        key = _generation_key(model, pk)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, int(time.time() * 1000), timeout=_generation_ttl())
+        _l1.discard((label, pk))
+        _stats["invalidations"] += 1
+
+
+def invalidate_on_commit(model, pks, using=None) -> None:
+    """
+    FR : invalidate() une fois la transaction validée (sinon un lecteur concurrent pourrait remettre l'ancienne valeur).
+    EN : invalidate() once the transaction has committed (otherwise a concurrent reader could re-cache the old value).
+    """
+    pks = list(pks)
+    transaction.on_commit(lambda: invalidate(model, pks), using=using)
+
+
+def clear_local() -> None:
+    """
+    FR : Vide le LRU du processus courant (tests, diagnostic) ; le cache partagé n'est pas touché.
+    EN : Empty the current process's LRU (tests, diagnostics); the shared cache is left untouched.
+    """
+    _l1.clear()
+
+
+def stats() -> dict:
+    """
+    FR : Statistiques du processus courant, avec le taux de succès et la taille du LRU.
+    EN : Statistics of the current process, with hit ratio and LRU size.
+    """
+    data = {name: _stats[name] for name in ("l1_hits", "l2_hits", "misses", "l1_evictions", "l1_expired", "invalidations")}
+    lookups = data["l1_hits"] + data["l2_hits"] + data["misses"]
+    data["hit_ratio"] = round((data["l1_hits"] + data["l2_hits"]) / lookups, 4) if lookups else None
+    data["l1_size"] = len(_l1)
+    return data
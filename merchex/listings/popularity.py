@@ -0,0 +1,244 @@
+"""
+Module: listings/popularity.py
+
+EN: Popularity tracking: per-worker buffered view counters flushed to hourly buckets in batched upserts,
+    and precomputed top-N rankings. Bilingual comments (EN/FR).
+FR : Suivi de popularité : compteurs de vues tamponnés par worker, vidés par lots (upsert) dans des tranches
+     horaires, et classements top-N précalculés. Commentaires bilingues (EN/FR).
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from listings.jobs import enqueue
+from listings.models import Job, Ranking, ViewBucket
+
+
+logger = logging.getLogger(__name__)
+
+# EN: Ranking kinds: name -> (counted model, trending window in hours or None for all-time)
+# FR : Types de classement : nom -> (modèle compté, fenêtre de tendance en heures ou None pour tout l'historique)
+RANKINGS = {
+    "most_viewed_listings": ("listing", None),
+    "trending_bands": ("band", settings.POPULARITY_TRENDING_HOURS),
+}
+
+
+# EN: Bucket holding the folded all-time total of each object (older than any trending window)
+# FR : Tranche contenant le total historique replié de chaque objet (plus ancienne que toute fenêtre de tendance)
+TOTAL_BUCKET = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def bucket_start(moment) -> object:
+    """
+    FR : Début de la tranche horaire contenant `moment`.
+    EN : Start of the hourly bucket containing `moment`.
+    """
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def add_views(rows) -> None:
+    """
+    FR : Ajoute des vues à des tranches : INSERT ... ON CONFLICT DO UPDATE SET views = views + excluded.views
+         (SQLite >= 3.24 et PostgreSQL). Préconditions : `rows` = [(model, object_id, bucket, vues)].
+    EN : Add views to buckets: INSERT ... ON CONFLICT DO UPDATE SET views = views + excluded.views
+         (SQLite >= 3.24 and PostgreSQL). Preconditions: `rows` = [(model, object_id, bucket, views)].
+    """
+    table = ViewBucket._meta.db_table
+    # EN: Raw SQL: bulk_create(update_conflicts=True) would overwrite the count instead of adding to it
+    # FR : SQL brut : bulk_create(update_conflicts=True) écraserait le compteur au lieu de l'incrémenter
+    sql = (
+        f'INSERT INTO "{table}" ("model", "object_id", "bucket", "views") VALUES (%s, %s, %s, %s) '
+        f'ON CONFLICT ("model", "object_id", "bucket") DO UPDATE SET "views" = "{table}"."views" + excluded."views"'
+    )
+    adapt = connection.ops.adapt_datetimefield_value
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(sql, [(model, object_id, adapt(bucket), n) for model, object_id, bucket, n in rows])
+
+
+class ViewCounter:
+    """
+    FR : Compteur de vues en mémoire (un par processus worker). record() est O(1) et n'accède jamais à la base :
+         un thread d'arrière-plan vide le tampon toutes les POPULARITY_FLUSH_INTERVAL secondes en un seul
+         upsert par lots, hors de toute requête HTTP.
+    EN : In-memory view counter (one per worker process). record() is O(1) and never touches the database:
+         a background thread flushes the buffer every POPULARITY_FLUSH_INTERVAL seconds in one batched
+         upsert, outside of any HTTP request.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Counter = Counter()
+        # EN: Flusher thread and the pid that started it (threads do not survive a fork)
+        # FR : Thread de vidage et pid qui l'a lancé (les threads ne survivent pas à un fork)
+        self._flusher: threading.Thread | None = None
+        self._flusher_pid: int | None = None
+        # EN: Last ranking window this worker enqueued a rebuild for
+        # FR : Dernière fenêtre de classement pour laquelle ce worker a mis une reconstruction en file
+        self._enqueued_window: int | None = None
+
+    def record(self, model: str, object_id: int) -> None:
+        with self._lock:
+            self._counts[model, object_id] += 1
+            if self._flusher_pid != os.getpid():
+                self._start_flusher()
+
+    def _start_flusher(self) -> None:
+        """
+        FR : Lance le thread de vidage (démon) du processus courant. Préconditions : self._lock détenu.
+        EN : Start the current process's (daemon) flusher thread. Preconditions: self._lock held.
+        """
+        self._flusher_pid = os.getpid()
+        self._flusher = threading.Thread(target=self._flush_forever, name="popularity-flush", daemon=True)
+        self._flusher.start()
+
+    def _flush_forever(self) -> None:
+        while True:
+            time.sleep(settings.POPULARITY_FLUSH_INTERVAL)
+            # EN: This thread owns its connection; drop it if it went stale between flushes
+            # FR : Ce thread possède sa connexion ; la fermer si elle a expiré entre deux vidages
+            try:
+                close_old_connections()
+                self.flush()
+            except Exception:
+                # EN: Never let the thread die: the counts would then pile up until the worker exits
+                # FR : Ne jamais laisser mourir le thread : les compteurs s'accumuleraient jusqu'à l'arrêt du worker
+                logger.exception("View counter flush loop failed")
+
+    def flush(self) -> int:
+        """
+        FR : Écrit le tampon via add_views(), puis met en file la reconstruction des classements de la fenêtre.
+             Les erreurs sont journalisées, jamais levées (exécuté sur le thread de vidage).
+             Retour : nombre de lignes (model, object_id) écrites.
+        EN : Write the buffer through add_views(), then queue the rankings rebuild of the current window.
+             Errors are logged, never raised (this runs on the flusher thread).
+             Returns: number of (model, object_id) rows written.
+        """
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+        if not counts:
+            return 0
+
+        bucket = bucket_start(timezone.now())
+        try:
+            add_views([(model, object_id, bucket, n) for (model, object_id), n in counts.items()])
+        except Exception:
+            # EN: Keep the counts for the next flush rather than losing them
+            # FR : Garder les compteurs pour le prochain vidage plutôt que de les perdre
+            with self._lock:
+                self._counts.update(counts)
+            logger.exception("Flushing view counters failed")
+            return 0
+
+        # EN: One rankings rebuild per refresh window: once per worker here, once overall via the idempotency key
+        # FR : Une reconstruction des classements par fenêtre : une fois par worker ici, une fois au total via
+        #      la clé d'idempotence
+        window = int(time.time() // settings.POPULARITY_RANKING_REFRESH)
+        if window != self._enqueued_window:
+            try:
+                enqueue("listings.rebuild_rankings", idempotency_key=f"rebuild_rankings:{window}", priority=-1)
+            except Exception:
+                # EN: The views are written; the rebuild is retried on the next flush
+                # FR : Les vues sont écrites ; la reconstruction est retentée au prochain vidage
+                logger.exception("Enqueuing the rankings rebuild failed")
+            else:
+                self._enqueued_window = window
+        return len(counts)
+
+
+# EN: Process-wide counter; remaining views are flushed when the worker exits
+# FR : Compteur du processus ; les vues restantes sont vidées à l'arrêt du worker
+counter = ViewCounter()
+atexit.register(counter.flush)
+
+
+def record_view(model: str, object_id: int) -> None:
+    """
+    FR : Compte une vue d'une page de détail (sans accès base, vidée en arrière-plan, voir ViewCounter).
+    EN : Count one detail-page view (no database access, flushed in the background, see ViewCounter).
+    """
+    counter.record(model, object_id)
+
+
+def rebuild_rankings(top_n: int | None = None) -> dict:
+    """
+    FR : Recalcule chaque classement de RANKINGS (somme des vues, fenêtre éventuelle) et remplace ses lignes.
+         Retour : {kind: nombre de lignes}.
+    EN : Recompute every ranking in RANKINGS (sum of views, optional window) and replace its rows.
+         Returns: {kind: number of rows}.
+    """
+    top_n = top_n or settings.POPULARITY_TOP_N
+    now = timezone.now()
+    prune(now)
+    sizes = {}
+    for kind, (model, window_hours) in RANKINGS.items():
+        buckets = ViewBucket.objects.filter(model=model)
+        if window_hours:
+            buckets = buckets.filter(bucket__gte=bucket_start(now - timedelta(hours=window_hours)))
+        top = buckets.values("object_id").annotate(score=Sum("views")).order_by("-score", "object_id")[:top_n]
+        rows = [
+            Ranking(kind=kind, rank=rank, object_id=row["object_id"], score=row["score"], computed_at=now)
+            for rank, row in enumerate(top, start=1)
+        ]
+        with transaction.atomic():
+            Ranking.objects.filter(kind=kind).delete()
+            Ranking.objects.bulk_create(rows)
+        sizes[kind] = len(rows)
+    return sizes
+
+
+def prune(now) -> None:
+    """
+    FR : Rétention, à chaque reconstruction : supprime les tâches de reconstruction réussies des fenêtres
+         passées, et les tranches plus anciennes que la plus longue fenêtre de tendance. Pour un modèle
+         classé aussi sur tout l'historique, ces tranches sont d'abord repliées dans TOTAL_BUCKET
+         (une ligne par objet). Les deux tables restent ainsi bornées.
+    EN : Retention, on every rebuild: delete the succeeded rebuild jobs of past windows, and the buckets
+         older than the longest trending window. For a model also ranked all-time, those buckets are first
+         folded into TOTAL_BUCKET (one row per object). Both tables thus stay bounded.
+    """
+    Job.objects.filter(
+        name="listings.rebuild_rankings",
+        status=Job.Status.SUCCEEDED,
+        finished_at__lt=now - timedelta(seconds=settings.POPULARITY_RANKING_REFRESH),
+    ).delete()
+
+    windows: dict[str, list] = {}
+    for model, window_hours in RANKINGS.values():
+        windows.setdefault(model, []).append(window_hours)
+    for model, hours in windows.items():
+        longest = max((h for h in hours if h), default=settings.POPULARITY_TRENDING_HOURS)
+        old = ViewBucket.objects.filter(model=model, bucket__lt=bucket_start(now - timedelta(hours=longest)))
+        old = old.exclude(bucket=TOTAL_BUCKET)
+        with transaction.atomic():
+            if None in hours:
+                totals = list(old.values("object_id").annotate(views=Sum("views")).values_list("object_id", "views"))
+                old.delete()
+                add_views([(model, object_id, TOTAL_BUCKET, views) for object_id, views in totals])
+            else:
+                old.delete()
+
+
+def ranked(kind: str, model) -> list[tuple[int, object, int]]:
+    """
+    FR : Lit un classement précalculé (2 requêtes). Les objets supprimés depuis sont ignorés.
+         Retour : liste de (rang, objet, score).
+    EN : Read a precomputed ranking (2 queries). Objects deleted since are skipped.
+         Returns: list of (rank, object, score).
+    """
+    rows = list(Ranking.objects.filter(kind=kind).order_by("rank").values_list("rank", "object_id", "score"))
+    objects = model.objects.in_bulk([object_id for _, object_id, _ in rows])
+    return [(rank, objects[object_id], score) for rank, object_id, score in rows if object_id in objects]
@@ -0,0 +1,155 @@
+"""
+Module: listings/ratelimit.py
+
+EN: Rate limiting for write endpoints with fixed-window counters stored in a dedicated Django cache
+    (atomic add + incr, no database access). Bilingual comments (EN/FR).
+FR : Limitation de débit des endpoints d'écriture par compteurs à fenêtre fixe stockés dans un cache Django
+     dédié (add + incr atomiques, aucun accès base de données). Commentaires bilingues (EN/FR).
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.http import HttpResponse
+
+
+logger = logging.getLogger(__name__)
+
+# EN: Period suffixes accepted in rates such as "5/m"
+# FR : Suffixes de période acceptés dans les débits comme "5/m"
+_PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# EN: Scopes declared by @ratelimit, used to report metrics
+# FR : Portées déclarées par @ratelimit, utilisées pour les métriques
+SCOPES: set[str] = set()
+
+
+def parse_rate(rate: str) -> tuple[int, int]:
+    """
+    FR : Convertit "N/période" (s, m, h, d) en (limite, durée de la fenêtre en secondes).
+         Erreurs : ValueError si le format est invalide.
+    EN : Convert "N/period" (s, m, h, d) into (limit, window length in seconds).
+         Errors: ValueError on an invalid format.
+    """
+    count, _, period = rate.partition("/")
+    if period not in _PERIODS or not count.isdigit() or int(count) < 1:
+        raise ValueError(f"Invalid rate {rate!r}, expected e.g. '5/m'")
+    return int(count), _PERIODS[period]
+
+
+def _cache():
+    # EN: Dedicated alias, so other cache traffic cannot evict the counters; it must be a shared
+    #     backend (memcached, redis, ...) for limits to hold across worker processes
+    # FR : Alias dédié, pour qu'aucun autre trafic de cache n'évince les compteurs ; il doit être un
+    #      backend partagé (memcached, redis, ...) pour que les limites valent entre workers
+    return caches[settings.RATELIMIT_CACHE]
+
+
+def is_process_local() -> bool:
+    """
+    FR : Vrai si le cache de limitation est propre à chaque processus (LocMemCache) : limites et métriques par worker.
+    EN : True when the rate-limit cache is private to each process (LocMemCache): limits and metrics are per worker.
+    """
+    return isinstance(_cache(), LocMemCache)
+
+
+def client_ip(request) -> str:
+    """
+    FR : Adresse IP du client, lue dans la clé META configurée (RATELIMIT_IP_META_KEY). Pour un en-tête de type
+         X-Forwarded-For, l'entrée la plus à droite est celle ajoutée par le proxy de confiance ; les entrées
+         de gauche sont fournies par le client et ne sont pas fiables.
+    EN : Client IP address, read from the configured META key (RATELIMIT_IP_META_KEY). For an
+         X-Forwarded-For style header, the rightmost entry is the one appended by the trusted proxy; the
+         entries on its left come from the client and cannot be trusted.
+    """
+    value = request.META.get(settings.RATELIMIT_IP_META_KEY, "") or ""
+    return value.split(",")[-1].strip() or "unknown"
+
+
+def hit(key: str, limit: int, period: int, now: float | None = None) -> float:
+    """
+    FR : Compte une requête dans la fenêtre courante de `key` (add puis incr : atomique dans le cache, même
+         avec des requêtes simultanées). Retour : 0.0 si la limite est respectée, sinon le délai (s) jusqu'à la
+         fenêtre suivante. Coût : deux opérations de cache (O(1)).
+    EN : Count one request in the current window of `key` (add then incr: atomic in the cache, even with
+         concurrent requests). Returns: 0.0 while within the limit, otherwise the delay (s) until the next
+         window. Cost: two cache operations (O(1)).
+    """
+    now = time.time() if now is None else now
+    window = int(now // period)
+    cache = _cache()
+    window_key = f"{key}:{window}"
+    cache.add(window_key, 0, timeout=period + 1)
+    try:
+        count = cache.incr(window_key)
+    except ValueError:
+        # EN: Expired between add() and incr(): this request opens the window
+        # FR : Expirée entre add() et incr() : cette requête ouvre la fenêtre
+        cache.add(window_key, 1, timeout=period + 1)
+        count = 1
+    if count <= limit:
+        return 0.0
+    return (window + 1) * period - now
+
+
+def _count_rejection(scope: str) -> None:
+    cache = _cache()
+    key = f"ratelimit:rejected:{scope}"
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # EN: Evicted between add() and incr(); the metric is best effort
+        # FR : Évincée entre add() et incr() ; la métrique est indicative
+        pass
+
+
+def rejection_counts() -> dict[str, int]:
+    """
+    FR : Nombre de requêtes rejetées (429) par portée, depuis le cache de limitation.
+    EN : Number of rejected (429) requests per scope, read from the rate-limit cache.
+    """
+    stored = _cache().get_many([f"ratelimit:rejected:{scope}" for scope in SCOPES])
+    return {scope: stored.get(f"ratelimit:rejected:{scope}", 0) for scope in sorted(SCOPES)}
+
+
+def ratelimit(per_ip: str, per_route: str, methods: tuple[str, ...] = ("POST",), scope: str | None = None):
+    """
+    FR : Décorateur : limite une vue par IP puis globalement par route (fenêtres fixes).
+         Une requête rejetée par la limite IP ne consomme pas la limite de la route.
+         Préconditions : débits au format "N/période". Retour : la vue décorée ; 429 + Retry-After si dépassé.
+    EN : Decorator: limit a view per IP, then globally per route (fixed windows).
+         A request rejected by the IP limit does not use up the route limit.
+         Preconditions: rates formatted "N/period". Returns: the wrapped view; 429 + Retry-After when exceeded.
+    """
+    ip_limit, route_limit = parse_rate(per_ip), parse_rate(per_route)
+
+    def decorator(view):
+        name = scope or view.__name__
+        SCOPES.add(name)
+
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if not settings.RATELIMIT_ENABLED or request.method not in methods:
+                return view(request, *args, **kwargs)
+
+            ip = client_ip(request)
+            retry_after = hit(f"ratelimit:{name}:ip:{ip}", *ip_limit) or hit(f"ratelimit:{name}:route", *route_limit)
+            if retry_after:
+                _count_rejection(name)
+                logger.warning("Rate limit exceeded on %s for %s", name, ip)
+                response = HttpResponse("Too many requests", status=429, content_type="text/plain")
+                response["Retry-After"] = str(math.ceil(retry_after))
+                return response
+            return view(request, *args, **kwargs)
+
+        return wrapped
+
+    return decorator
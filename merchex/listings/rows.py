@@ -0,0 +1,103 @@
+"""
+Module: listings/rows.py
+
+EN: Lightweight read-only rows for list pages and management commands, streamed with values_list().iterator().
+    Bilingual comments (EN/FR).
+FR : Lignes légères en lecture seule pour les pages de liste et les commandes de gestion, lues en flux avec
+     values_list().iterator(). Commentaires bilingues (EN/FR).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+# EN: Import local models (only used to build the queries and the choice labels)
+# FR : Importation des modèles locaux (utilisés seulement pour les requêtes et les libellés de choix)
+from listings.models import Band, Listing
+
+
+# EN: Rows fetched per database round-trip when streaming
+# FR : Nombre de lignes récupérées par aller-retour base de données en mode flux
+DEFAULT_CHUNK_SIZE = 2000
+
+# EN: Choice labels resolved once instead of per row
+# FR : Libellés de choix résolus une seule fois au lieu de par ligne
+_LISTING_TYPE_LABELS = dict(Listing.Type.choices)
+
+
+# ===============================
+#  Band row / Ligne de groupe
+# ===============================
+class BandRow:
+    """
+    FR : Ligne de groupe minimale (id, name) sans état ORM.
+         Préconditions : aucune. Erreurs : aucune.
+    EN : Minimal band row (id, name) without ORM state.
+         Preconditions: none. Errors: none.
+    """
+
+    __slots__ = ("id", "name")
+
+    # EN: Columns fetched by values_list(), in constructor order
+    # FR : Colonnes récupérées par values_list(), dans l'ordre du constructeur
+    fields = ("id", "name")
+
+    def __init__(self, id: int, name: str) -> None:
+        self.id = id
+        self.name = name
+
+
+# ====================================
+#  Listing row / Ligne d'annonce
+# ====================================
+class ListingRow:
+    """
+    FR : Ligne d'annonce minimale (id, title, type) ; la description (400 caractères) n'est jamais chargée.
+         Préconditions : aucune. Erreurs : aucune.
+    EN : Minimal listing row (id, title, type); the 400-char description is never loaded.
+         Preconditions: none. Errors: none.
+    """
+
+    __slots__ = ("id", "title", "type")
+
+    fields = ("id", "title", "type")
+
+    def __init__(self, id: int, title: str, type: str) -> None:
+        self.id = id
+        self.title = title
+        self.type = type
+
+    def get_type_display(self) -> str:
+        """
+        FR : Même API que Listing.get_type_display pour que les templates restent inchangés.
+        EN : Same API as Listing.get_type_display so templates stay unchanged.
+        """
+        return _LISTING_TYPE_LABELS.get(self.type, self.type)
+
+
+# ==============================
+#  Iterators / Itérateurs
+# ==============================
+
+def iter_band_rows(queryset=None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[BandRow]:
+    """
+    FR : Parcourt les groupes en flux sous forme de BandRow (aucun cache de queryset).
+         Préconditions : queryset de Band optionnel (défaut : tous). Retour : itérateur de BandRow.
+    EN : Stream bands as BandRow objects (no queryset result cache).
+         Preconditions: optional Band queryset (default: all). Returns: iterator of BandRow.
+    """
+    queryset = Band.objects.all() if queryset is None else queryset
+    for values in queryset.values_list(*BandRow.fields).iterator(chunk_size=chunk_size):
+        yield BandRow(*values)
+
+
+def iter_listing_rows(queryset=None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[ListingRow]:
+    """
+    FR : Parcourt les annonces en flux sous forme de ListingRow (aucun cache de queryset).
+         Préconditions : queryset de Listing optionnel (défaut : toutes). Retour : itérateur de ListingRow.
+    EN : Stream listings as ListingRow objects (no queryset result cache).
+         Preconditions: optional Listing queryset (default: all). Returns: iterator of ListingRow.
+    """
+    queryset = Listing.objects.all() if queryset is None else queryset
+    for values in queryset.values_list(*ListingRow.fields).iterator(chunk_size=chunk_size):
+        yield ListingRow(*values)
@@ -0,0 +1,53 @@
+"""
+Module: listings/signals.py
+
+EN: Signal receivers that feed the change log (Change model) and invalidate the object cache on every
+    save/delete of Band and Listing, including admin edits and QuerySet.delete(). Bilingual comments (EN/FR).
+FR : Récepteurs de signaux qui alimentent le journal des changements (modèle Change) et invalident le cache
+     d'objets à chaque save/delete de Band et Listing, y compris les éditions admin et QuerySet.delete().
+     Commentaires bilingues (EN/FR).
+"""
+
+from __future__ import annotations
+
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from listings import objectcache
+from listings.models import Band, Change, Listing
+
+
+@receiver(post_save, sender=Band)
+@receiver(post_save, sender=Listing)
+def record_save(sender, instance, created, raw=False, **kwargs):
+    # EN: Fixtures (loaddata) are not application changes
+    # FR : Les fixtures (loaddata) ne sont pas des changements applicatifs
+    if raw:
+        return
+    Change.record(instance, Change.Action.CREATE if created else Change.Action.UPDATE)
+    if not created:
+        objectcache.invalidate_on_commit(sender, [instance.pk], kwargs.get("using"))
+
+
+@receiver(post_delete, sender=Band)
+@receiver(post_delete, sender=Listing)
+def record_delete(sender, instance, **kwargs):
+    Change.record(instance, Change.Action.DELETE)
+    objectcache.invalidate_on_commit(sender, [instance.pk], kwargs.get("using"))
+
+
+@receiver(pre_delete, sender=Band)
+def record_band_detach(sender, instance, **kwargs):
+    """
+    FR : on_delete=SET_NULL met à jour les annonces du groupe sans signal : on incrémente leur version
+         (les formulaires ouverts avant ne doivent pas rattacher le groupe supprimé) et on les journalise ici.
+    EN : on_delete=SET_NULL updates the band's listings without signals: bump their version (forms opened
+         earlier must not re-attach the deleted band) and log them here.
+    """
+    ids = list(Listing.objects.filter(band_id=instance.pk).values_list("pk", flat=True))
+    # EN: _base_manager: plain UPDATE, logged just below with the SET_NULL value
+    # FR : _base_manager : UPDATE simple, journalisé juste en dessous avec la valeur SET_NULL
+    Listing._base_manager.filter(pk__in=ids).update(version=F("version") + 1)
+    Change.record_bulk(Listing, ids, Change.Action.UPDATE, overrides={"band_id": None})
+    objectcache.invalidate_on_commit(Listing, ids, kwargs.get("using"))
@@ -0,0 +1,79 @@
+"""
+Module: listings/streaming.py
+
+EN: Streaming rendering for long list pages: the page head is sent first, then rows in chunks.
+    Bilingual comments (EN/FR).
+FR : Rendu en flux pour les longues pages de liste : l'en-tête de page part en premier, puis les lignes
+     par morceaux. Commentaires bilingues (EN/FR).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from itertools import islice
+
+from django.conf import settings
+from django.http import HttpRequest, StreamingHttpResponse
+from django.shortcuts import render
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+
+
+# EN: Placeholder rendered where the rows go; the page is split around it
+# FR : Marqueur rendu à l'emplacement des lignes ; la page est découpée autour de lui
+ROWS_MARKER = mark_safe("<!--listings:rows-->")
+
+
+def _chunks(rows: Iterable, size: int):
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def render_list(
+    request: HttpRequest,
+    template_name: str,
+    rows_template_name: str,
+    rows: Iterable,
+    context: dict | None = None,
+) -> StreamingHttpResponse:
+    """
+    FR : Rend `template_name` en flux : tout ce qui précède {{ rows_marker }} (dont l'en-tête de base.html)
+         est envoyé d'abord, puis `rows_template_name` est rendu par morceaux de LIST_STREAMING_CHUNK_SIZE
+         lignes (variable de template `rows`), puis la fin de la page. Mémoire constante quel que soit le nombre
+         de lignes si `rows` est un itérateur.
+         Préconditions : le template contient {{ rows_marker }} ; rows_template_name gère {% empty %}.
+         Retour : StreamingHttpResponse (ou HttpResponse classique si LIST_STREAMING vaut False).
+    EN : Render `template_name` as a stream: everything before {{ rows_marker }} (including the base.html head)
+         is sent first, then `rows_template_name` is rendered in chunks of LIST_STREAMING_CHUNK_SIZE rows
+         (template variable `rows`), then the end of the page. Constant memory whatever the number of rows
+         when `rows` is an iterator.
+         Preconditions: the template contains {{ rows_marker }}; rows_template_name handles {% empty %}.
+         Returns: StreamingHttpResponse (or a regular HttpResponse when LIST_STREAMING is False).
+    """
+    context = dict(context or {})
+
+    if not settings.LIST_STREAMING:
+        # EN: Buffered mode: the rows template is included in place of the marker
+        # FR : Mode tamponné : le template des lignes est inclus à la place du marqueur
+        context["rows_marker"] = get_template(rows_template_name).render({"rows": rows})
+        return render(request, template_name, context)
+
+    context["rows_marker"] = ROWS_MARKER
+    head, tail = get_template(template_name).render(context, request).split(ROWS_MARKER, 1)
+    rows_template = get_template(rows_template_name)
+    chunk_size = settings.LIST_STREAMING_CHUNK_SIZE
+
+    def stream():
+        yield head
+        empty = True
+        for chunk in _chunks(rows, chunk_size):
+            empty = False
+            yield rows_template.render({"rows": chunk})
+        if empty:
+            yield rows_template.render({"rows": []})
+        yield tail
+
+    # NOTE (EN): under ASGI Django consumes sync iterators fully before sending; streaming applies to WSGI workers.
+    # NOTE (FR) : sous ASGI, Django consomme entièrement les itérateurs synchrones ; le flux concerne les workers WSGI.
+    return StreamingHttpResponse(stream())
@@ -0,0 +1,64 @@
+"""
+Module: listings/tasks.py
+
+EN: Background tasks of the "listings" app, run by `manage.py run_jobs`. Bilingual comments (EN/FR).
+FR : Tâches de fond de l'application "listings", exécutées par `manage.py run_jobs`. Commentaires bilingues (EN/FR).
+"""
+
+from __future__ import annotations
+
+import csv
+
+from listings import popularity
+from listings.jobs import report_progress, task
+from listings.models import Listing
+from listings.rows import iter_listing_rows
+
+
+@task("listings.export_listings")
+def export_listings(job, path: str) -> dict:
+    """
+    FR : Exporte toutes les annonces (id, title, type) en CSV vers `path`, en flux.
+         Retour : {"path", "rows"}. Erreurs : OSError si le fichier ne peut pas être écrit.
+    EN : Export every listing (id, title, type) as CSV to `path`, streamed.
+         Returns: {"path", "rows"}. Errors: OSError if the file cannot be written.
+    """
+    total = Listing.objects.count()
+    written = 0
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(("id", "title", "type"))
+        for row in iter_listing_rows():
+            writer.writerow((row.id, row.title, row.type))
+            written += 1
+            if written % 10_000 == 0:
+                report_progress(job, written, total, "exporting")
+    report_progress(job, written, total, "done")
+    return {"path": path, "rows": written}
+
+
+@task("listings.delete_sold_listings")
+def delete_sold_listings(job, batch_size: int = 1000) -> dict:
+    """
+    FR : Supprime les annonces vendues par lots (transactions courtes, la base reste disponible).
+         Retour : {"deleted"}. Reprise possible : une nouvelle tentative continue là où elle s'est arrêtée.
+    EN : Delete sold listings in batches (short transactions keep the database available).
+         Returns: {"deleted"}. Resumable: a retry continues where the previous attempt stopped.
+    """
+    total = Listing.objects.filter(sold=True).count()
+    deleted = 0
+    while ids := list(Listing.objects.filter(sold=True).values_list("id", flat=True)[:batch_size]):
+        deleted += Listing.objects.filter(id__in=ids).delete()[0]
+        report_progress(job, deleted, total, "deleting")
+    return {"deleted": deleted}
+
+
+@task("listings.rebuild_rankings")
+def rebuild_rankings(job, top_n: int | None = None) -> dict:
+    """
+    FR : Reconstruit les classements top-N (mis en file par les vidages des compteurs de vues).
+         Retour : {kind: nombre de lignes}.
+    EN : Rebuild the top-N rankings (queued by the view-counter flushes).
+         Returns: {kind: number of rows}.
+    """
+    return popularity.rebuild_rankings(top_n)
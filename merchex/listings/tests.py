@@ -1,3 +1,677 @@
-from django.test import TestCase
+"""
+Module: listings/tests.py
 
-# Create your tests here.
+EN: Tests of the "listings" app. Query plan regression tests: every view of listings/views.py and every
+    admin changelist is requested against a seeded dataset; the SQL it issues is captured and checked
+    with EXPLAIN QUERY PLAN (SQLite). A test fails when a query scans a watched table without an index
+    (unless the view declares it), or when a view issues more queries than its budget.
+    Behaviour tests follow, one class per feature. Bilingual comments (EN/FR).
+FR : Tests de l'application "listings". Tests de non-régression des plans de requête : chaque vue de
+     listings/views.py et chaque liste de l'admin est appelée sur un jeu de données ; le SQL émis est
+     capturé et vérifié avec EXPLAIN QUERY PLAN (SQLite). Un test échoue si une requête parcourt une
+     table surveillée sans index (sauf si la vue le déclare), ou si une vue dépasse son budget de requêtes.
+     Suivent des tests de comportement, une classe par fonctionnalité. Commentaires bilingues (EN/FR).
+"""
+
+from __future__ import annotations
+
+import re
+import unittest
+from io import StringIO
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.http import Http404, HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from listings import compression, jobs, objectcache, popularity
+from listings.concurrency import CONFLICT_MESSAGE, conflict_form, save_changed_fields
+from listings.forms import BandForm
+from listings.jobs import enqueue
+from listings.models import Band, Change, Job, Listing, Ranking, VersionConflict, ViewBucket
+from listings.ratelimit import client_ip, hit, ratelimit, rejection_counts
+
+
+# EN: Tables that must never be scanned without an index, unless a view declares it
+# FR : Tables qui ne doivent jamais être parcourues sans index, sauf si une vue le déclare
+WATCHED_TABLES = ("listings_listing", "listings_band")
+
+# EN: "SCAN <table>" ("SCAN TABLE <table>" before SQLite 3.36) with no "USING ... INDEX" is a full table
+#     scan in SQLite's EXPLAIN QUERY PLAN
+# FR : « SCAN <table> » (« SCAN TABLE <table> » avant SQLite 3.36) sans « USING ... INDEX » est un parcours
+#      complet dans EXPLAIN QUERY PLAN de SQLite
+FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$")
+
+
+# EN: URL name -> (path or callable returning it, query budget, full scans allowed by design)
+# FR : Nom d'URL -> (chemin ou fonction le renvoyant, budget de requêtes, parcours complets voulus)
+VIEW_BUDGETS = {
+    "bands": ("/bands/", 1, {"listings_band"}),
+    "band-create": ("/bands/add/", 0, set()),
+    "band-detail": (lambda t: f"/bands/{t.band.id}/", 1, set()),
+    "band-update": (lambda t: f"/bands/{t.band.id}/change/", 1, set()),
+    "band-delete": (lambda t: f"/bands/{t.band.id}/delete/", 1, set()),
+    "trending-bands": ("/bands/trending/", 2, set()),
+    "listings": ("/listings/", 1, {"listings_listing"}),
+    # EN: The ListingForm band <select> lists every band by design
+    # FR : Le <select> de groupe de ListingForm liste tous les groupes par conception
+    "listing_create": ("/listings/add/", 1, {"listings_band"}),
+    "listing_detail": (lambda t: f"/listings/{t.listing.id}/", 2, set()),
+    "listing_update": (lambda t: f"/listings/{t.listing.id}/change/", 2, {"listings_band"}),
+    "listing_delete": (lambda t: f"/listings/{t.listing.id}/delete/", 1, set()),
+    "popular_listings": ("/listings/popular/", 2, set()),
+    "changes": (lambda t: f"/changes/?since={t.since}", 1, set()),
+    "about": ("/about-us/", 0, set()),
+    "contact": ("/contact-us/", 0, set()),
+}
+
+# EN: Staff-only views, requested logged in
+# FR : Vues réservées au staff, appelées en étant connecté
+STAFF_VIEW_BUDGETS = {
+    "object_cache_stats": ("/cache-stats/", 1, set()),
+    "ratelimit_stats": ("/ratelimit-stats/", 1, set()),
+}
+
+# EN: Admin changelists (logged in as a superuser); the newest-first page is a rowid scan with LIMIT
+# FR : Listes de l'admin (connecté en superutilisateur) ; la page « plus récents d'abord » est un parcours rowid avec LIMIT
+ADMIN_BUDGETS = {
+    "band": (4, {"listings_band"}),
+    "listing": (4, {"listings_listing"}),
+    "job": (4, set()),
+    "change": (4, set()),
+}
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN output is SQLite specific")
+# EN: No background view-counter flush into the test database; tearDown flushes explicitly
+# FR : Aucun vidage des compteurs de vues en arrière-plan dans la base de test ; tearDown vide explicitement
+@override_settings(POPULARITY_FLUSH_INTERVAL=10**9)
+class QueryPlanTests(TestCase):
+    """
+    EN: Per-view query budgets and index usage on a seeded dataset.
+    FR : Budgets de requêtes par vue et usage des index sur un jeu de données.
+    """
+
+    BANDS = 200
+    LISTINGS_PER_BAND = 10
+
+    @classmethod
+    def setUpTestData(cls):
+        bands = Band.objects.bulk_create(Band(name=f"Band {i}") for i in range(cls.BANDS))
+        Listing.objects.bulk_create(
+            Listing(title=f"Listing {i}", description="d" * 400, band=band)
+            for band in bands
+            for i in range(cls.LISTINGS_PER_BAND)
+        )
+        cls.band = bands[len(bands) // 2]
+        cls.listing = Listing.objects.filter(band=cls.band).first()
+        cls.since = Change.objects.order_by("-seq").values_list("seq", flat=True)[100]
+        Ranking.objects.bulk_create(
+            Ranking(kind=kind, rank=rank, object_id=obj.id, score=100 - rank, computed_at=timezone.now())
+            for kind, objs in (("trending_bands", bands[:50]), ("most_viewed_listings", Listing.objects.all()[:50]))
+            for rank, obj in enumerate(objs, start=1)
+        )
+        enqueue("listings.rebuild_rankings")
+        cls.admin = User.objects.create_superuser("admin", "admin@merchex.xyz", "password")
+
+    def setUp(self):
+        # EN: Detail pages must be measured on a cold object cache
+        # FR : Les pages de détail sont mesurées avec un cache d'objets froid
+        caches[settings.OBJECT_CACHE_ALIAS].clear()
+        caches[settings.RATELIMIT_CACHE].clear()
+        objectcache.clear_local()
+
+    def tearDown(self):
+        popularity.counter.flush()
+
+    def capture(self, path: str) -> list[str]:
+        """
+        FR : GET `path` (flux consommé compris) et renvoie le SQL émis.
+        EN : GET `path` (including the consumed stream) and return the SQL it issued.
+        """
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(path)
+            if response.streaming:
+                b"".join(response.streaming_content)
+        self.assertEqual(response.status_code, 200, path)
+        return [query["sql"] for query in captured.captured_queries]
+
+    def full_scans(self, queries: list[str]) -> dict[str, str]:
+        """
+        FR : Tables surveillées parcourues sans index -> première requête fautive.
+        EN : Watched tables scanned without an index -> first offending query.
+        """
+        scans = {}
+        with connection.cursor() as cursor:
+            for sql in queries:
+                if not sql.lstrip().upper().startswith("SELECT"):
+                    continue
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                for *_, detail in cursor.fetchall():
+                    match = FULL_SCAN.match(detail)
+                    if match and match.group(1) in WATCHED_TABLES:
+                        scans.setdefault(match.group(1), sql)
+        return scans
+
+    def check(self, path: str, budget: int, allowed_scans: set[str]) -> None:
+        queries = self.capture(path)
+        self.assertLessEqual(
+            len(queries), budget, f"{path} issued {len(queries)} queries (budget {budget}):\n" + "\n".join(queries)
+        )
+        unexpected = {table: sql for table, sql in self.full_scans(queries).items() if table not in allowed_scans}
+        self.assertFalse(unexpected, f"{path} scans without an index: {unexpected}")
+
+    def test_views(self):
+        for name, (path, budget, allowed_scans) in VIEW_BUDGETS.items():
+            with self.subTest(view=name):
+                self.setUp()
+                self.check(path(self) if callable(path) else path, budget, allowed_scans)
+
+    def test_staff_views_and_admin_changelists(self):
+        self.client.force_login(self.admin)
+        for name, (path, budget, allowed_scans) in STAFF_VIEW_BUDGETS.items():
+            with self.subTest(view=name):
+                self.check(path, budget, allowed_scans)
+        for model, (budget, allowed_scans) in ADMIN_BUDGETS.items():
+            with self.subTest(changelist=model):
+                self.check(f"/admin/listings/{model}/", budget, allowed_scans)
+
+    def test_known_full_scan_is_detected(self):
+        """
+        EN: /listings/ declares its full scan: if the detector stops seeing it, every check above is a no-op.
+        FR : /listings/ déclare son parcours complet : si le détecteur ne le voit plus, tous les contrôles
+             ci-dessus deviennent inopérants.
+        """
+        self.assertIn("listings_listing", self.full_scans(self.capture("/listings/")))
+        for detail in ("SCAN listings_listing", "SCAN TABLE listings_listing", "SCAN TABLE listings_listing AS T"):
+            with self.subTest(detail=detail):
+                self.assertEqual(FULL_SCAN.match(detail).group(1), "listings_listing")
+        self.assertIsNone(FULL_SCAN.match("SCAN TABLE listings_listing USING INDEX listings_listing_band_id"))
+
+    def test_every_view_has_a_budget(self):
+        """
+        EN: A new route must declare its budget here before it can be merged.
+        FR : Une nouvelle route doit déclarer son budget ici avant d'être fusionnée.
+        """
+        from merchex.urls import urlpatterns
+
+        names = {pattern.name for pattern in urlpatterns if getattr(pattern, "name", None)}
+        self.assertEqual(names - VIEW_BUDGETS.keys() - STAFF_VIEW_BUDGETS.keys(), set())
+
+
+class RateLimitTests(TestCase):
+    """
+    EN: Fixed-window counters of listings/ratelimit.py.
+    FR : Compteurs à fenêtre fixe de listings/ratelimit.py.
+    """
+
+    def setUp(self):
+        caches[settings.RATELIMIT_CACHE].clear()
+        self.factory = RequestFactory()
+        self.view = ratelimit(per_ip="3/m", per_route="5/m", scope="test")(lambda request: HttpResponse("ok"))
+
+    def post(self, ip="10.0.0.1", **extra):
+        return self.view(self.factory.post("/", REMOTE_ADDR=ip, **extra))
+
+    def test_rejects_over_the_ip_limit_with_retry_after(self):
+        codes = [self.post().status_code for _ in range(4)]
+        self.assertEqual(codes, [200, 200, 200, 429])
+        response = self.post()
+        self.assertTrue(1 <= int(response["Retry-After"]) <= 60)
+        self.assertEqual(rejection_counts()["test"], 2)
+
+    def test_route_limit_applies_across_ips(self):
+        codes = [self.post(ip=f"10.0.0.{i}").status_code for i in range(6)]
+        self.assertEqual(codes, [200] * 5 + [429])
+
+    def test_ip_rejections_do_not_use_up_the_route_limit(self):
+        for _ in range(10):
+            self.post(ip="10.0.0.1")
+        self.assertEqual(self.post(ip="10.0.0.2").status_code, 200)
+
+    def test_next_window_allows_again(self):
+        for _ in range(3):
+            self.assertEqual(hit("k", 3, 60, now=120.0), 0.0)
+        self.assertEqual(hit("k", 3, 60, now=150.0), 30.0)
+        self.assertEqual(hit("k", 3, 60, now=180.0), 0.0)
+
+    def test_get_is_not_limited(self):
+        for _ in range(10):
+            self.assertEqual(self.view(self.factory.get("/", REMOTE_ADDR="10.0.0.1")).status_code, 200)
+
+    def test_concurrent_burst_admits_exactly_the_limit(self):
+        with ThreadPoolExecutor(20) as pool:
+            results = list(pool.map(lambda _: hit("burst", 5, 60), range(50)))
+        self.assertEqual(results.count(0.0), 5)
+
+    @override_settings(RATELIMIT_IP_META_KEY="HTTP_X_FORWARDED_FOR")
+    def test_client_ip_is_the_entry_added_by_the_proxy(self):
+        request = self.factory.post("/", HTTP_X_FORWARDED_FOR="1.2.3.4, 203.0.113.9")
+        self.assertEqual(client_ip(request), "203.0.113.9")
+
+    def test_other_cache_traffic_does_not_evict_counters(self):
+        for _ in range(3):
+            self.post()
+        for i in range(1000):
+            caches["default"].set(f"noise:{i}", i)
+        self.assertEqual(self.post().status_code, 429)
+
+
+@unittest.skipIf(compression.brotli is None, "brotli is not installed")
+class CompressionTests(TestCase):
+    """
+    EN: Brotli is only used where it cannot leak a secret (BREACH).
+    FR : Brotli n'est utilisé que là où il ne peut pas divulguer de secret (BREACH).
+    """
+
+    def get(self, path):
+        return self.client.get(path, HTTP_ACCEPT_ENCODING="br, gzip")
+
+    def test_anonymous_page_uses_brotli(self):
+        self.assertEqual(self.get("/bands/")["Content-Encoding"], "br")
+
+    def test_csrf_form_page_falls_back_to_gzip(self):
+        self.assertEqual(self.get("/bands/add/")["Content-Encoding"], "gzip")
+
+
+class JobQueueTests(TestCase):
+    """
+    EN: Claim, retry, idempotency and stale-lock handling of listings/jobs.py.
+    FR : Prise, nouvelles tentatives, idempotence et verrous abandonnés de listings/jobs.py.
+    """
+
+    def setUp(self):
+        self.calls = []
+
+        def ok(job, **payload):
+            self.calls.append(payload)
+            return {"ok": True}
+
+        def boom(job, **payload):
+            raise RuntimeError("boom")
+
+        self.enterContext(patch.dict(jobs.TASKS, {"test.ok": ok, "test.boom": boom}))
+
+    def test_claim_takes_highest_priority_first_and_only_once(self):
+        low = enqueue("test.ok")
+        high = enqueue("test.ok", priority=5)
+        self.assertEqual(jobs.claim("w1").id, high.id)
+        self.assertEqual(jobs.claim("w2").id, low.id)
+        self.assertIsNone(jobs.claim("w3"))
+        high.refresh_from_db()
+        self.assertEqual((high.status, high.locked_by, high.attempts), (Job.Status.RUNNING, "w1", 1))
+
+    def test_claim_skips_jobs_not_yet_due(self):
+        job = enqueue("test.ok")
+        Job.objects.filter(id=job.id).update(run_after=timezone.now() + timedelta(minutes=5))
+        self.assertIsNone(jobs.claim("w1"))
+
+    def test_success_stores_the_result(self):
+        enqueue("test.ok", {"n": 1})
+        job = jobs.run(jobs.claim("w1"))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result, job.locked_by), (Job.Status.SUCCEEDED, {"ok": True}, ""))
+        self.assertEqual(self.calls, [{"n": 1}])
+
+    def test_failure_is_retried_with_backoff_then_fails(self):
+        enqueue("test.boom", max_attempts=2)
+        job = jobs.run(jobs.claim("w1"))
+        self.assertEqual(job.status, Job.Status.QUEUED)
+        self.assertGreater(job.run_after, timezone.now())
+        Job.objects.filter(id=job.id).update(run_after=timezone.now())
+        job = jobs.run(jobs.claim("w1"))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.Status.FAILED, 2))
+        self.assertIn("RuntimeError: boom", job.last_error)
+
+    def test_result_that_cannot_be_stored_is_a_failed_attempt(self):
+        jobs.TASKS["test.ok"] = lambda job, **payload: {"not json": object()}
+        enqueue("test.ok")
+        job = jobs.run(jobs.claim("w1"))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result), (Job.Status.QUEUED, None))
+        self.assertIn("TypeError", job.last_error)
+
+    def test_worker_survives_a_pool_error(self):
+        enqueue("test.ok")
+        with patch.object(jobs, "run_by_id", side_effect=RuntimeError("pool")):
+            call_command("run_jobs", "--burst", "--workers=1", stdout=StringIO(), stderr=StringIO())
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.locked_by), (Job.Status.QUEUED, ""))
+        self.assertIn("RuntimeError: pool", job.last_error)
+
+    def test_idempotency_key_returns_the_existing_job(self):
+        first = enqueue("test.ok", idempotency_key="once")
+        second = enqueue("test.ok", idempotency_key="once")
+        self.assertEqual(first.id, second.id)
+        self.assertEqual(Job.objects.count(), 1)
+
+    def test_stale_job_is_requeued_until_max_attempts_then_failed(self):
+        retry = enqueue("test.ok", max_attempts=3)
+        last = enqueue("test.ok", max_attempts=1)
+        jobs.claim("w1")
+        jobs.claim("w1")
+        Job.objects.update(locked_at=timezone.now() - timedelta(hours=2))
+        self.assertEqual(jobs.requeue_stale(timedelta(hours=1)), (1, 1))
+        retry.refresh_from_db()
+        last.refresh_from_db()
+        self.assertEqual(retry.status, Job.Status.QUEUED)
+        self.assertEqual(last.status, Job.Status.FAILED)
+
+    def test_heartbeat_and_progress_keep_the_lock_fresh(self):
+        enqueue("test.ok")
+        enqueue("test.ok")
+        beating, progressing = jobs.claim("w1"), jobs.claim("w1")
+        Job.objects.update(locked_at=timezone.now() - timedelta(hours=2))
+        self.assertEqual(jobs.heartbeat("w1", [beating.id]), 1)
+        jobs.report_progress(progressing, 1, 2, "half")
+        self.assertEqual(jobs.requeue_stale(timedelta(hours=1)), (0, 0))
+        self.assertEqual(jobs.heartbeat("other-worker", [beating.id]), 0)
+
+
+class ChangeLogTests(TestCase):
+    """
+    EN: Every write path of Band and Listing leaves an entry in the change log.
+    FR : Chaque chemin d'écriture de Band et Listing laisse une entrée dans le journal des changements.
+    """
+
+    def setUp(self):
+        self.band = Band.objects.create(name="Band")
+        self.listing = Listing.objects.create(title="Listing", description="d", band=self.band)
+        self.since = Change.objects.order_by("-seq").values_list("seq", flat=True).first()
+
+    def changes(self) -> list[tuple]:
+        return [
+            (change.model, change.object_id, change.action, change.data)
+            for change in Change.objects.filter(seq__gt=self.since).order_by("seq")
+        ]
+
+    def test_save_and_delete(self):
+        self.band.name = "Renamed"
+        self.band.save()
+        listing_id = self.listing.id
+        self.listing.delete()
+        (band_model, band_id, band_action, data), listing_change = self.changes()
+        self.assertEqual((band_model, band_id, band_action), ("band", self.band.id, Change.Action.UPDATE))
+        self.assertEqual(data["name"], "Renamed")
+        self.assertEqual(listing_change, ("listing", listing_id, Change.Action.DELETE, None))
+
+    def test_queryset_update_logs_the_new_values(self):
+        Listing.objects.filter(band=self.band).update(sold=False)
+        [(model, object_id, action, data)] = self.changes()
+        self.assertEqual((model, object_id, action), ("listing", self.listing.id, Change.Action.UPDATE))
+        self.assertFalse(data["sold"])
+
+    def test_bulk_create_and_bulk_update(self):
+        bands = Band.objects.bulk_create([Band(name="A"), Band(name="B")])
+        for band in bands:
+            band.name += "!"
+        Band.objects.bulk_update(bands, ["name"])
+        self.assertEqual(
+            [(object_id, action, data["name"]) for _, object_id, action, data in self.changes()],
+            [
+                (bands[0].id, Change.Action.CREATE, "A"),
+                (bands[1].id, Change.Action.CREATE, "B"),
+                (bands[0].id, Change.Action.UPDATE, "A!"),
+                (bands[1].id, Change.Action.UPDATE, "B!"),
+            ],
+        )
+
+    def test_band_delete_logs_the_set_null_listings(self):
+        band_id = self.band.id
+        self.band.delete()
+        (listing_model, listing_id, listing_action, data), band_change = self.changes()
+        self.assertEqual((listing_model, listing_id), ("listing", self.listing.id))
+        self.assertEqual(listing_action, Change.Action.UPDATE)
+        self.assertIsNone(data["band_id"])
+        self.assertEqual(band_change, ("band", band_id, Change.Action.DELETE, None))
+
+    def test_admin_is_read_only(self):
+        self.client.force_login(User.objects.create_superuser("admin", "admin@merchex.xyz", "password"))
+        change = Change.objects.first()
+        self.assertEqual(self.client.get("/admin/listings/change/").status_code, 200)
+        self.assertEqual(self.client.get("/admin/listings/change/add/").status_code, 403)
+        self.assertEqual(self.client.get(f"/admin/listings/change/{change.seq}/delete/").status_code, 403)
+        self.assertEqual(
+            self.client.post(f"/admin/listings/change/{change.seq}/change/", {"model": "x"}).status_code, 403
+        )
+        self.assertEqual(Change.objects.get(seq=change.seq).model, change.model)
+
+
+class OptimisticConcurrencyTests(TestCase):
+    """
+    EN: Version checks of VersionedModel.save(), the edit views and the admin.
+    FR : Contrôles de version de VersionedModel.save(), des vues d'édition et de l'admin.
+    """
+
+    def setUp(self):
+        self.band = Band.objects.create(name="Band", genre=Band.Genre.JAZZ, year_formed=2000)
+        self.client.force_login(User.objects.create_superuser("admin", "admin@merchex.xyz", "password"))
+
+    def form_data(self, **overrides) -> dict:
+        data = {"name": "Band", "genre": Band.Genre.JAZZ, "year_formed": 2000, "version": 0}
+        return {**data, **overrides}
+
+    def admin_data(self, **overrides) -> dict:
+        return self.form_data(active="on", **overrides)
+
+    def test_save_bumps_the_version_after_writing(self):
+        self.band.name = "Renamed"
+        self.band.save()
+        self.assertEqual(self.band.version, 1)
+        self.assertEqual(Band.objects.get(id=self.band.id).version, 1)
+
+    def test_stale_save_raises_and_writes_nothing(self):
+        first, second = Band.objects.get(id=self.band.id), Band.objects.get(id=self.band.id)
+        first.name = "First"
+        first.save()
+        second.name = "Second"
+        with self.assertRaises(VersionConflict):
+            second.save()
+        self.assertEqual(second.version, 0)
+        self.assertEqual(Band.objects.get(id=self.band.id).name, "First")
+
+    def test_stale_form_post_after_admin_save_is_a_conflict(self):
+        url = reverse("band-update", args=[self.band.id])
+        self.client.post(f"/admin/listings/band/{self.band.id}/change/", self.admin_data(name="Admin"))
+        response = self.client.post(url, self.form_data(name="Form"))
+        self.assertEqual(response.context["form"].non_field_errors(), [CONFLICT_MESSAGE])
+        self.assertEqual(Band.objects.get(id=self.band.id).name, "Admin")
+        # EN: The re-rendered form carries the current version: a new submit overwrites knowingly
+        # FR : Le formulaire ré-affiché porte la version courante : un nouvel envoi écrase en connaissance de cause
+        self.assertRedirects(
+            self.client.post(url, self.form_data(name="Form", version=1)),
+            reverse("band-detail", args=[self.band.id]),
+            fetch_redirect_response=False,
+        )
+        self.assertEqual(Band.objects.get(id=self.band.id).name, "Form")
+
+    def test_stale_admin_save_after_form_post_is_a_conflict(self):
+        url = f"/admin/listings/band/{self.band.id}/change/"
+        self.assertContains(self.client.get(url), 'name="version" value="0"')
+        self.client.post(reverse("band-update", args=[self.band.id]), self.form_data(name="Form"))
+        response = self.client.post(url, self.admin_data(name="Admin"))
+        self.assertRedirects(response, url, fetch_redirect_response=False)
+        self.assertEqual(Band.objects.get(id=self.band.id).name, "Form")
+
+    def test_stale_form_post_after_queryset_update_is_a_conflict(self):
+        Band.objects.filter(id=self.band.id).update(name="Bulk")
+        response = self.client.post(reverse("band-update", args=[self.band.id]), self.form_data(name="Form"))
+        self.assertEqual(response.context["form"].non_field_errors(), [CONFLICT_MESSAGE])
+        self.assertEqual(Band.objects.get(id=self.band.id).name, "Bulk")
+
+    def test_edit_view_bumps_the_version_once(self):
+        self.client.post(reverse("band-update", args=[self.band.id]), self.form_data(name="Form"))
+        self.assertEqual(Band.objects.get(id=self.band.id).version, 1)
+
+    def test_band_delete_bumps_the_detached_listings(self):
+        listing = Listing.objects.create(title="Listing", description="d", band=self.band)
+        self.band.delete()
+        listing.refresh_from_db()
+        self.assertEqual((listing.band_id, listing.version), (None, 1))
+        self.assertEqual(Change.objects.filter(model="listing").latest("seq").data["version"], 1)
+
+    def test_row_deleted_during_the_edit_is_a_404(self):
+        form = BandForm(self.form_data(name="Form"), instance=self.band)
+        self.assertTrue(form.is_valid())
+        Band.objects.filter(id=self.band.id).delete()
+        self.assertFalse(save_changed_fields(form))
+        with self.assertRaises(Http404):
+            conflict_form(BandForm, RequestFactory().post("/", self.form_data(name="Form")), self.band)
+
+    def test_post_without_version_is_rejected(self):
+        data = self.form_data(name="No version")
+        del data["version"]
+        response = self.client.post(reverse("band-update", args=[self.band.id]), data)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("version", response.context["form"].errors)
+        self.assertEqual(Band.objects.get(id=self.band.id).name, "Band")
+
+
+@override_settings(POPULARITY_FLUSH_INTERVAL=10**9)
+class PopularityTests(TestCase):
+    """
+    EN: Buffered view counters, background flusher and retention of listings/popularity.py.
+    FR : Compteurs de vues tamponnés, vidage en arrière-plan et rétention de listings/popularity.py.
+    """
+
+    def setUp(self):
+        self.counter = popularity.ViewCounter()
+
+    def test_record_never_touches_the_database(self):
+        with self.assertNumQueries(0):
+            for _ in range(3):
+                self.counter.record("band", 1)
+
+    def test_flush_adds_to_the_hourly_bucket(self):
+        for views in (2, 3):
+            for _ in range(views):
+                self.counter.record("band", 1)
+            self.assertEqual(self.counter.flush(), 1)
+        self.assertEqual(ViewBucket.objects.get(model="band", object_id=1).views, 5)
+        self.assertEqual(self.counter.flush(), 0)
+
+    def test_rebuild_is_enqueued_once_per_window(self):
+        with patch.object(popularity, "enqueue") as enqueue_mock:
+            for _ in range(3):
+                self.counter.record("listing", 1)
+                self.counter.flush()
+        self.assertEqual(enqueue_mock.call_count, 1)
+
+    def test_failed_enqueue_is_logged_and_retried_on_the_next_flush(self):
+        with patch.object(popularity, "enqueue", side_effect=OperationalError("database is locked")) as enqueue_mock:
+            self.counter.record("listing", 1)
+            with self.assertLogs("listings.popularity", "ERROR"):
+                self.assertEqual(self.counter.flush(), 1)
+            self.counter.record("listing", 1)
+            with self.assertLogs("listings.popularity", "ERROR"):
+                self.counter.flush()
+        self.assertEqual(enqueue_mock.call_count, 2)
+        self.assertEqual(ViewBucket.objects.get(model="listing", object_id=1).views, 2)
+
+    def test_flusher_thread_survives_errors(self):
+        stop = RuntimeError("stop")
+        with (
+            patch.object(popularity.time, "sleep", side_effect=[None, None, stop]),
+            patch.object(self.counter, "flush", side_effect=OperationalError("database is locked")) as flush,
+            self.assertLogs("listings.popularity", "ERROR"),
+            self.assertRaises(RuntimeError),
+        ):
+            self.counter._flush_forever()
+        self.assertEqual(flush.call_count, 2)
+
+    def test_prune_bounds_jobs_and_buckets(self):
+        now = timezone.now()
+        old = popularity.bucket_start(now - timedelta(hours=settings.POPULARITY_TRENDING_HOURS + 2))
+        popularity.add_views([
+            ("listing", 1, old, 3),
+            ("listing", 1, old - timedelta(hours=1), 4),
+            ("listing", 1, popularity.bucket_start(now), 5),
+            ("band", 1, old, 6),
+        ])
+        done = enqueue("listings.rebuild_rankings", idempotency_key="rebuild_rankings:1")
+        Job.objects.filter(id=done.id).update(status=Job.Status.SUCCEEDED, finished_at=now - timedelta(hours=1))
+        popularity.rebuild_rankings()
+        self.assertFalse(Job.objects.filter(id=done.id).exists())
+        self.assertFalse(ViewBucket.objects.filter(model="band").exists())
+        self.assertEqual(
+            sorted(ViewBucket.objects.filter(model="listing").values_list("bucket", "views")),
+            [(popularity.TOTAL_BUCKET, 7), (popularity.bucket_start(now), 5)],
+        )
+        self.assertEqual(Ranking.objects.get(kind="most_viewed_listings").score, 12)
+
+
+class ObjectCacheTests(TestCase):
+    """
+    EN: Tiers and invalidation of listings/objectcache.py.
+    FR : Niveaux et invalidation de listings/objectcache.py.
+    """
+
+    def setUp(self):
+        self.cache = caches[settings.OBJECT_CACHE_ALIAS]
+        self.cache.clear()
+        objectcache.clear_local()
+        self.band = Band.objects.create(name="Band")
+        self.generation_key = f"objcache:gen:listings.band:{self.band.id}"
+
+    def test_second_read_is_served_from_the_cache(self):
+        with self.assertNumQueries(1):
+            objectcache.get(Band, self.band.id)
+        with self.assertNumQueries(0):
+            objectcache.get(Band, self.band.id)
+        objectcache.clear_local()
+        with self.assertNumQueries(0):
+            self.assertEqual(objectcache.get(Band, self.band.id).name, "Band")
+
+    def test_save_invalidates(self):
+        objectcache.get(Band, self.band.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.band.name = "Renamed"
+            self.band.save()
+        self.assertEqual(objectcache.get(Band, self.band.id).name, "Renamed")
+
+    def test_queryset_update_and_delete_invalidate(self):
+        objectcache.get(Band, self.band.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            Band.objects.filter(id=self.band.id).update(name="Updated")
+        self.assertEqual(objectcache.get(Band, self.band.id).name, "Updated")
+        with self.captureOnCommitCallbacks(execute=True):
+            Band.objects.get(id=self.band.id).delete()
+        self.assertIsNone(objectcache.get(Band, self.band.id))
+
+    def test_missing_object_leaves_no_key(self):
+        with self.assertRaises(Http404):
+            objectcache.get_or_404(Band, 10**6)
+        self.assertIsNone(self.cache.get("objcache:gen:listings.band:1000000"))
+
+    def test_generation_has_a_finite_ttl(self):
+        objectcache.get(Band, self.band.id)
+        with patch.object(self.cache, "add", wraps=self.cache.add) as add:
+            self.cache.delete(self.generation_key)
+            objectcache.clear_local()
+            objectcache.get(Band, self.band.id)
+        self.assertGreaterEqual(add.call_args.kwargs["timeout"], settings.OBJECT_CACHE_L2_TTL)
+
+    def test_expired_generation_never_serves_an_older_entry(self):
+        objectcache.get(Band, self.band.id)
+        # EN: Write that skips the invalidation, then the generation expires
+        # FR : Écriture qui contourne l'invalidation, puis la génération expire
+        Band._base_manager.filter(id=self.band.id).update(name="Behind the cache's back")
+        self.cache.delete(self.generation_key)
+        objectcache.clear_local()
+        self.assertEqual(objectcache.get(Band, self.band.id).name, "Behind the cache's back")
+
+    def test_copy_read_while_the_generation_appeared_is_not_cached(self):
+        with patch.object(self.cache, "add", return_value=False):
+            self.assertEqual(objectcache.get(Band, self.band.id).name, "Band")
+        with self.assertNumQueries(1):
+            objectcache.get(Band, self.band.id)
@@ -5,22 +5,34 @@ FR : Vues Django propres et commentées pour l'application "listings". Tous les
 
 from __future__ import annotations
 
+import os
+
 # EN: Django imports
 # FR : Importations Django
+from django.contrib.admin.views.decorators import staff_member_required
 from django.core.mail import send_mail
-from django.http import HttpRequest, HttpResponse
+from django.http import HttpRequest, HttpResponse, HttpResponseBadRequest, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 
-# EN: Local app imports (models and forms from this app)
-# FR : Importations locales de l'app (modèles et formulaires de cette app)
+# EN: Local app imports (models, forms and helpers from this app)
+# FR : Importations locales de l'app (modèles, formulaires et utilitaires de cette app)
+from listings import objectcache
+from listings.changes import DEFAULT_LIMIT, changes_since
+from listings.concurrency import conflict_form, save_changed_fields
+from listings.decorators import anonymous_read_only
 from listings.forms import BandForm, ContactUsForm, ListingForm
 from listings.models import Band, Listing
+from listings.popularity import ranked, record_view
+from listings.ratelimit import is_process_local, ratelimit, rejection_counts
+from listings.rows import iter_band_rows, iter_listing_rows
+from listings.streaming import render_list
 
 
 # ==============================
 #           BAND (CRUD)
 # ==============================
 
+@ratelimit(per_ip="10/m", per_route="120/m")
 def band_create(request: HttpRequest) -> HttpResponse:
     """
     FR : Crée un nouveau Band et redirige vers son détail en cas de succès.
@@ -41,29 +53,33 @@ def band_create(request: HttpRequest) -> HttpResponse:
     return render(request, "listings/band_create.html", {"form": form})
 
 
+@anonymous_read_only
 def band_list(request: HttpRequest) -> HttpResponse:
     """
-    FR : Affiche la liste de tous les groupes.
-         Préconditions : aucune. Retour : HttpResponse avec contexte {"bands"}.
+    FR : Affiche la liste de tous les groupes (lignes légères BandRow, sans instances de modèle).
+         Préconditions : aucune. Retour : réponse en flux (voir listings/streaming.py).
          Erreurs : aucune (penser à la pagination si gros volume).
-    EN : Display all bands.
-         Preconditions: none. Returns: HttpResponse with {"bands"}.
+    EN : Display all bands (lightweight BandRow objects, no model instances).
+         Preconditions: none. Returns: streaming response (see listings/streaming.py).
          Errors: none (consider pagination for large datasets).
     """
-    bands = Band.objects.all()  # EN: could paginate / FR : pagination possible
-    return render(request, "listings/band_list.html", {"bands": bands})
+    bands = iter_band_rows()  # EN: could paginate / FR : pagination possible
+    # EN: Head sent first, rows streamed in chunks / FR : en-tête envoyé d'abord, lignes en flux par morceaux
+    return render_list(request, "listings/band_list.html", "listings/band_rows.html", bands)
 
 
+@anonymous_read_only
 def band_detail(request: HttpRequest, id: int) -> HttpResponse:
     """
-    FR : Affiche les détails d'un groupe par id (404 si absent).
+    FR : Affiche les détails d'un groupe par id (404 si absent), servi par le cache d'objets.
          Préconditions : id valide. Retour : HttpResponse avec contexte {"band"}.
          Erreurs : 404 si non trouvé.
-    EN : Show a single band's details by id (404 if missing).
+    EN : Show a single band's details by id (404 if missing), served from the object cache.
          Preconditions: valid id. Returns: HttpResponse with {"band"}.
          Errors: 404 when not found.
     """
-    band = get_object_or_404(Band, id=id)  # EN/FR: safer retrieval (404 on miss)
+    band = objectcache.get_or_404(Band, id)  # EN: cached, 404 on miss / FR : en cache, 404 si absent
+    record_view("band", band.id)  # EN: buffered, no DB write / FR : tamponné, pas d'écriture en base
     return render(request, "listings/band_detail.html", {"band": band})
 
 
@@ -71,18 +87,20 @@ def band_update(request: HttpRequest, id: int) -> HttpResponse:
     """
     FR : Met à jour un Band existant et redirige vers son détail.
          Préconditions : id existant, POST avec données valides. Retour : HttpResponse ou redirection.
-         Erreurs : 404 si id invalide ; validation formulaire sinon.
+         Erreurs : 404 si id invalide ; validation formulaire sinon ; conflit de version (formulaire ré-affiché).
     EN : Update an existing Band and redirect to its detail.
          Preconditions: existing id, POST with valid data. Returns: HttpResponse or redirect.
-         Errors: 404 if invalid id; form validation otherwise.
+         Errors: 404 if invalid id; form validation otherwise; version conflict (form re-rendered).
     """
     band = get_object_or_404(Band, id=id)
 
     if request.method == "POST":
         form = BandForm(request.POST, instance=band)
         if form.is_valid():
-            form.save()
-            return redirect("band-detail", id=band.id)
+            # EN: Conditional UPDATE of the changed fields only / FR : UPDATE conditionnel des seuls champs modifiés
+            if save_changed_fields(form):
+                return redirect("band-detail", id=band.id)
+            form = conflict_form(BandForm, request, band)
     else:
         form = BandForm(instance=band)  # EN: pre-filled / FR : pré-rempli
 
@@ -111,6 +129,7 @@ def band_delete(request, id):
 #          LISTING (CRUD)
 # ===============================
 
+@ratelimit(per_ip="10/m", per_route="120/m")
 def listing_create(request: HttpRequest) -> HttpResponse:
     """
     FR : Crée une nouvelle annonce et redirige vers la liste (ou autre vue si souhaité).
@@ -131,48 +150,56 @@ def listing_create(request: HttpRequest) -> HttpResponse:
     return render(request, "listings/listing_create.html", {"form": form})
 
 
+@anonymous_read_only
 def listings(request: HttpRequest) -> HttpResponse:
     """
-    FR : Affiche toutes les annonces.
-         Préconditions : aucune. Retour : HttpResponse avec contexte {"listings"}.
+    FR : Affiche toutes les annonces (lignes légères ListingRow, description non chargée).
+         Préconditions : aucune. Retour : réponse en flux (voir listings/streaming.py).
          Erreurs : aucune (penser pagination/tri).
-    EN : Display all listings.
-         Preconditions: none. Returns: HttpResponse with {"listings"}.
+    EN : Display all listings (lightweight ListingRow objects, description not loaded).
+         Preconditions: none. Returns: streaming response (see listings/streaming.py).
          Errors: none (consider pagination/sorting).
     """
-    items = Listing.objects.all()
-    return render(request, "listings/listings.html", {"listings": items})
+    items = iter_listing_rows()
+    return render_list(request, "listings/listings.html", "listings/listing_rows.html", items)
 
 
+@anonymous_read_only
 def listing_detail(request, id):
     """
-    FR : Affiche le détail d'une annonce (404 si absente).
-         Préconditions : id valide. Retour : HttpResponse avec contexte {"listing"}.
+    FR : Affiche le détail d'une annonce (404 si absente), servi par le cache d'objets.
+         Préconditions : id valide. Retour : HttpResponse avec contexte {"listing", "band"}.
          Erreurs : 404 si non trouvée.
-    EN : Show a single listing (404 if missing).
-         Preconditions: valid id. Returns: HttpResponse with {"listing"}.
+    EN : Show a single listing (404 if missing), served from the object cache.
+         Preconditions: valid id. Returns: HttpResponse with {"listing", "band"}.
          Errors: 404 when not found.
     """
-    listing = get_object_or_404(Listing, id=id)  # EN: safer retrieval / FR : récupération plus sûre
-    return render(request, "listings/listing_detail.html", {"listing": listing})
+    listing = objectcache.get_or_404(Listing, id)  # EN: cached, 404 on miss / FR : en cache, 404 si absent
+    # EN: The band comes from the cache too (listing.band would query it)
+    # FR : Le groupe vient aussi du cache (listing.band ferait une requête)
+    band = objectcache.get(Band, listing.band_id) if listing.band_id else None
+    record_view("listing", listing.id)  # EN: buffered, no DB write / FR : tamponné, pas d'écriture en base
+    return render(request, "listings/listing_detail.html", {"listing": listing, "band": band})
 
 
 def listing_update(request, id):
     """
     FR : Met à jour une annonce existante et redirige vers son détail.
          Préconditions : id existant, POST valide. Retour : HttpResponse ou redirection.
-         Erreurs : 404 si id invalide ; erreurs de formulaire sinon.
+         Erreurs : 404 si id invalide ; erreurs de formulaire sinon ; conflit de version (formulaire ré-affiché).
     EN : Update an existing Listing and redirect to its detail.
          Preconditions: existing id, valid POST. Returns: HttpResponse or redirect.
-         Errors: 404 if invalid id; form errors otherwise.
+         Errors: 404 if invalid id; form errors otherwise; version conflict (form re-rendered).
     """
     listing = get_object_or_404(Listing, id=id)
 
     if request.method == "POST":
         form = ListingForm(request.POST, instance=listing)
         if form.is_valid():
-            form.save()
-            return redirect("listing_detail", id=listing.id)  # EN/FR: name with underscore kept
+            # EN: Conditional UPDATE of the changed fields only / FR : UPDATE conditionnel des seuls champs modifiés
+            if save_changed_fields(form):
+                return redirect("listing_detail", id=listing.id)  # EN/FR: name with underscore kept
+            form = conflict_form(ListingForm, request, listing)
     else:
         form = ListingForm(instance=listing)
 
@@ -197,10 +224,93 @@ def listing_delete(request, id):
     return render(request, "listings/listing_delete.html", {"listing": listing})
 
 
+# ===============================
+#     POPULARITY / POPULARITÉ
+# ===============================
+
+@anonymous_read_only
+def popular_listings(request: HttpRequest) -> HttpResponse:
+    """
+    FR : Annonces les plus vues, lues dans le classement précalculé (aucune agrégation à la requête).
+         Préconditions : aucune. Retour : HttpResponse avec contexte {"ranking"} : liste de (rang, annonce, vues).
+         Erreurs : aucune (liste vide tant que le classement n'a pas été calculé).
+    EN : Most viewed listings, read from the precomputed ranking (no aggregation per request).
+         Preconditions: none. Returns: HttpResponse with {"ranking"}: list of (rank, listing, views).
+         Errors: none (empty list until the ranking has been computed).
+    """
+    ranking = ranked("most_viewed_listings", Listing)
+    return render(request, "listings/popular_listings.html", {"ranking": ranking})
+
+
+@anonymous_read_only
+def trending_bands(request: HttpRequest) -> HttpResponse:
+    """
+    FR : Groupes tendances (vues des dernières POPULARITY_TRENDING_HOURS heures), depuis le classement précalculé.
+         Préconditions : aucune. Retour : HttpResponse avec contexte {"ranking"} : liste de (rang, groupe, vues).
+         Erreurs : aucune.
+    EN : Trending bands (views over the last POPULARITY_TRENDING_HOURS hours), from the precomputed ranking.
+         Preconditions: none. Returns: HttpResponse with {"ranking"}: list of (rank, band, views).
+         Errors: none.
+    """
+    ranking = ranked("trending_bands", Band)
+    return render(request, "listings/trending_bands.html", {"ranking": ranking})
+
+
+# ===============================
+#       CHANGE FEED / JOURNAL
+# ===============================
+
+def changes(request: HttpRequest) -> HttpResponse:
+    """
+    FR : Flux des changements de Band/Listing depuis la séquence `since` (paramètres GET since, limit).
+         Préconditions : since et limit entiers. Retour : JsonResponse (voir listings/changes.py).
+         Erreurs : 400 si un paramètre n'est pas un entier.
+    EN : Band/Listing change feed since sequence `since` (GET parameters since, limit).
+         Preconditions: integer since and limit. Returns: JsonResponse (see listings/changes.py).
+         Errors: 400 if a parameter is not an integer.
+    """
+    try:
+        since = int(request.GET.get("since", 0))
+        limit = int(request.GET.get("limit", DEFAULT_LIMIT))
+    except ValueError:
+        return HttpResponseBadRequest("since and limit must be integers")
+
+    return JsonResponse(changes_since(since, limit))
+
+
+# ==============================
+#         CACHE STATS
+# ==============================
+
+@staff_member_required
+def object_cache_stats(request: HttpRequest) -> HttpResponse:
+    """
+    FR : Statistiques du cache d'objets du worker qui répond (succès L1/L2, échecs, évictions).
+         Préconditions : utilisateur staff. Retour : JsonResponse. Erreurs : redirection vers la connexion admin sinon.
+    EN : Object cache statistics of the worker serving the request (L1/L2 hits, misses, evictions).
+         Preconditions: staff user. Returns: JsonResponse. Errors: redirect to the admin login otherwise.
+    """
+    return JsonResponse({"pid": os.getpid(), **objectcache.stats()})
+
+
+@staff_member_required
+def ratelimit_stats(request: HttpRequest) -> HttpResponse:
+    """
+    FR : Rejets (429) par route, lus dans le cache de limitation. Avec un cache local au processus, ce sont
+         les compteurs du worker qui répond (voir "process_local").
+         Préconditions : utilisateur staff. Retour : JsonResponse.
+    EN : Rejections (429) per route, read from the rate-limit cache. With a process-local cache these are
+         the counters of the serving worker (see "process_local").
+         Preconditions: staff user. Returns: JsonResponse.
+    """
+    return JsonResponse({"pid": os.getpid(), "process_local": is_process_local(), "rejected": rejection_counts()})
+
+
 # ==============================
 #          PAGES / DIVERS
 # ==============================
 
+@anonymous_read_only
 def about(request: HttpRequest) -> HttpResponse:
     """
     FR : Page statique « À propos ».
@@ -213,6 +323,7 @@ def about(request: HttpRequest) -> HttpResponse:
     return render(request, "listings/about.html")
 
 
+@ratelimit(per_ip="3/m", per_route="30/m")
 def contact(request: HttpRequest) -> HttpResponse:
     """
     FR : Gère le formulaire de contact : affichage en GET, validation + envoi d'email en POST.
@@ -40,16 +40,34 @@ INSTALLED_APPS = [
     'listings',
 ]
 
+# Session/CSRF/auth/messages are subclasses that are skipped for anonymous GET/HEAD
+# requests to views marked @anonymous_read_only (see listings/middleware.py).
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'listings.compression.CompressionMiddleware',
+    'listings.middleware.AnonymousReadOnlyMiddleware',
+    'listings.middleware.FastPathSessionMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
+    'listings.middleware.FastPathCsrfViewMiddleware',
+    'listings.middleware.FastPathAuthenticationMiddleware',
+    'listings.middleware.FastPathMessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Sessions live in a signed cookie, so they never hit the django_session table
+SESSION_ENGINE = 'django.contrib.sessions.backends.signed_cookies'
+
+# Responses smaller than this (bytes) are sent uncompressed; brotli is used when installed
+COMPRESSION_MIN_LENGTH = 500
+COMPRESSION_BROTLI_QUALITY = 5
+
+# Stream the long list pages (head first, then rows in chunks); see listings/streaming.py
+LIST_STREAMING = True
+LIST_STREAMING_CHUNK_SIZE = 500
+
+# Seconds an upstream cache may keep anonymous read-only pages (Cache-Control: public)
+ANONYMOUS_READ_ONLY_MAX_AGE = 60
+
 ROOT_URLCONF = 'merchex.urls'
 
 TEMPLATES = [
@@ -81,6 +99,64 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# LocMemCache is per process: point these at memcached/redis in production so that
+# rate limits and cached objects are shared by all workers. Rate-limit counters and
+# cached objects each have their own alias so that other cache traffic can never evict them.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'ratelimit': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'ratelimit',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    'objects': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'objects',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+
+
+# Rate limiting of write endpoints (see listings/ratelimit.py)
+
+RATELIMIT_ENABLED = True
+
+RATELIMIT_CACHE = 'ratelimit'
+
+# Use e.g. 'HTTP_X_FORWARDED_FOR' behind a trusted reverse proxy (its rightmost entry is used)
+RATELIMIT_IP_META_KEY = 'REMOTE_ADDR'
+
+
+# Object cache for hot Band/Listing detail pages (see listings/objectcache.py)
+
+OBJECT_CACHE_ALIAS = 'objects'
+
+# In-process LRU: max entries and seconds before an entry is re-checked against the shared cache
+OBJECT_CACHE_L1_SIZE = 500
+OBJECT_CACHE_L1_TTL = 5
+
+# Seconds an instance stays in the shared cache
+OBJECT_CACHE_L2_TTL = 300
+
+
+# Popularity tracking (see listings/popularity.py)
+
+# Seconds between flushes of each worker's in-memory view counters (background thread, never in a request)
+POPULARITY_FLUSH_INTERVAL = 5
+
+# Seconds between two rebuilds of the precomputed rankings (run by `manage.py run_jobs`)
+POPULARITY_RANKING_REFRESH = 60
+
+POPULARITY_TOP_N = 50
+
+POPULARITY_TRENDING_HOURS = 24
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
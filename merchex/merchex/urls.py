@@ -36,6 +36,10 @@ urlpatterns = [
     # FR : Créer un nouveau groupe
     path("bands/add/", views.band_create, name="band-create"),
 
+    # EN: Trending bands (precomputed ranking)
+    # FR : Groupes tendances (classement précalculé)
+    path("bands/trending/", views.trending_bands, name="trending-bands"),
+
     # EN: Band detail by id
     # FR : Détails d'un groupe par id
     path("bands/<int:id>/", views.band_detail, name="band-detail"),
@@ -56,10 +60,30 @@ urlpatterns = [
     # FR : Créer une nouvelle annonce
     path("listings/add/", views.listing_create, name="listing_create"),
 
+    # EN: Most viewed listings (precomputed ranking)
+    # FR : Annonces les plus vues (classement précalculé)
+    path("listings/popular/", views.popular_listings, name="popular_listings"),
+
     # EN: Detail page for a single listing (lookup by id, required argument)
     # FR : Page de détail pour une annonce (recherche par id, argument requis)
     path("listings/<int:id>/", views.listing_detail, name="listing_detail"),
 
+    # -----------------------------
+    # Change feed / Journal des changements
+    # -----------------------------
+
+    # EN: Band/Listing changes since a sequence number (JSON, paginated)
+    # FR : Changements de Band/Listing depuis un numéro de séquence (JSON, paginé)
+    path("changes/", views.changes, name="changes"),
+
+    # EN: Object cache statistics of the serving worker (staff only)
+    # FR : Statistiques du cache d'objets du worker qui répond (staff uniquement)
+    path("cache-stats/", views.object_cache_stats, name="object_cache_stats"),
+
+    # EN: Rate-limit rejections per route (staff only)
+    # FR : Rejets du limiteur de débit par route (staff uniquement)
+    path("ratelimit-stats/", views.ratelimit_stats, name="ratelimit_stats"),
+
     # -----------------------------
     # Static pages / Pages statiques
     # -----------------------------